@@ -4,6 +4,7 @@ from inspect import isgenerator, isgeneratorfunction
 from functools import partial, wraps
 from contextlib import contextmanager
 from contextvars import ContextVar
+from .identity_map import IdentityMap
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +25,21 @@ class Adapter:
     def get_context(self):
         return self._context
 
+    def get_identity_map(self) -> IdentityMap | None:
+        """Get the identity map for the current context, if it has one.
+
+        Context-free use has no natural scope, so never gets an identity map.
+        """
+        try:
+            context = self._context.get()
+        except LookupError:
+            return None
+        if context is None:
+            return None
+        if "identity_map" not in context:
+            context["identity_map"] = IdentityMap()
+        return context["identity_map"]
+
     @contextmanager
     def context_free(self) -> Generator[ContextVar[dict[str, Any] | None], None, None]:
         with self.context(_ctx=None) as cvar:
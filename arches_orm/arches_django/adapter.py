@@ -1,4 +1,5 @@
 import logging
+from contextlib import contextmanager
 from arches_orm.adapter import Adapter
 
 logger = logging.getLogger(__name__)
@@ -13,18 +14,82 @@ class ArchesDjangoAdapter(Adapter):
     #   save_crosses: bool
     #      whether to save, or cache, resourceXresource models explicitly
     #      or leave it for Postgres
+    #   defer_index: bool
+    #      whether saves leave resources queued for indexing, until
+    #      flush_index is called, rather than indexing them at once
+    #   index_flush_interval: float
+    #      if set, seconds between flushes of the index queue by a
+    #      background thread, which makes a last flush at exit
+    #   permission_cache_ttl: float
+    #      seconds for which a user's graph and nodegroup permissions are
+    #      cached across requests, or 0 (the default) to check them on every
+    #      request; changes are only seen at once in the process making them,
+    #      so other processes may use stale permissions for up to this long
+    #   permission_cache_size: int
+    #      most permission checks to cache before evicting the oldest used
 
     key = "arches-django"
+    _index_queue = None
+    _permission_cache = None
+
+    def get_index_queue(self):
+        from .index_queue import IndexQueue
+
+        if self._index_queue is None:
+            self._index_queue = IndexQueue(flush_interval=self.config.get("index_flush_interval"))
+        return self._index_queue
+
+    def get_permission_cache(self):
+        # Importing the cache connects the signals that invalidate it.
+        from .permission_cache import PermissionCache, PERMISSION_CACHE_TTL, PERMISSION_CACHE_SIZE
+
+        if self._permission_cache is None:
+            self._permission_cache = PermissionCache(
+                ttl=self.config.get("permission_cache_ttl", PERMISSION_CACHE_TTL),
+                max_size=self.config.get("permission_cache_size", PERMISSION_CACHE_SIZE),
+            )
+        return self._permission_cache
+
+    def invalidate_permissions(self, user_id=None):
+        """Drop cached permissions for a user or, if none is given, for everyone."""
+        if self._permission_cache is not None:
+            self._permission_cache.invalidate(user_id)
+
+    def index(self, wrapper_cls, resourceids):
+        """Index resources of a model once saved, or, if deferred, when the block ends or the queue is flushed."""
+        self.get_index_queue().add(
+            wrapper_cls, resourceids, flush=not self.config.get("defer_index", False)
+        )
+
+    def flush_index(self) -> int:
+        """Index any resources waiting in the queue."""
+        return self.get_index_queue().flush()
+
+    @contextmanager
+    def deferred_index(self):
+        """Index resources saved within this block together, when it ends."""
+        with self.get_index_queue().deferred() as queue:
+            yield queue
 
     def get_wrapper(self):
         from .wrapper import ArchesDjangoResourceWrapper
 
         return ArchesDjangoResourceWrapper
 
-    def load_from_id(self, resource_id, from_prefetch=None, lazy=False):
+    def load_from_id(self, resource_id, from_prefetch=None, lazy=False, related=False):
         from arches_orm.wkrm import get_resource_models_for_adapter
         from arches.app.models.resource import Resource
 
+        # Related instances each record their parent, so cannot be shared,
+        # but can be rebuilt from what was loaded for an earlier reference.
+        identity_map = self.get_identity_map()
+        if identity_map is not None:
+            if related:
+                if (builder := identity_map.get_builder(resource_id)):
+                    return builder()
+            elif not lazy and (wkri := identity_map.get(resource_id)):
+                return wkri
+
         # Note that this will load an unpermissioned resource before
         # checking resources. This may be avoidable...
         resource = (
@@ -38,9 +103,25 @@ class ArchesDjangoAdapter(Adapter):
         if str(resource.graph_id) not in resource_models_by_graph_id:
             logger.error("Tried to load non-existent WKRM: %s", resource_id)
             return None
-        return resource_models_by_graph_id[str(resource.graph_id)].from_resource(
+        wkrm = resource_models_by_graph_id[str(resource.graph_id)]
+        # As for find, only fully loaded instances are shared.
+        if identity_map is None or (lazy and not related):
+            return wkrm.from_resource(
+                resource, related_prefetch=from_prefetch, lazy=lazy
+            )
+        if related:
+            builder = wkrm._._hydrator(
+                resource,
+                wkrm._._get_allowed_tiles(resourceinstance=resource),
+                related_prefetch=from_prefetch
+            )
+            identity_map.add_builder(resource_id, builder)
+            return builder()
+        wkri = wkrm.from_resource(
             resource, related_prefetch=from_prefetch, lazy=lazy
         )
+        identity_map.add(wkri)
+        return wkri
 
     def get_hooks(self):
         from .hooks import HOOKS
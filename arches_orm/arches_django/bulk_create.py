@@ -1,31 +1,33 @@
 from datetime import datetime
 import json
 import logging
+import re
 import uuid
 import functools
-from arches.app.search.mappings import TERMS_INDEX, RESOURCES_INDEX
+from copy import deepcopy
 from starlette_context import context
 from django.db import transaction, connection
-from arches.app.search.search_engine_factory import SearchEngineInstance as se
 from arches.app.models.system_settings import settings as system_settings
-from arches.app.models.models import ResourceXResource, Node
+from arches.app.models.models import ResourceXResource, Node, LoadEvent, TileModel
 from arches.app.models import resource as resource_module
+from arches.app.models.resource import Resource
 from arches.app.datatypes import concept_types as concept_module
 from django.db.utils import IntegrityError, ProgrammingError
 from django.utils.translation import gettext as _, get_language
 from arches.app.models.models import FunctionXGraph
-from arches.app.utils.betterJSONSerializer import JSONSerializer
 from arches.app.etl_modules.base_import_module import BaseImportModule
 
+from .crosses import CrossChanges
+from .staging import StagingRow, StagingWriter, tile_depths
+from .indexing import fetch_resources_with_tiles, index_resources
+from .load_report import LoadReport
+
 logger = logging.getLogger(__name__)
-FORMAT = '%(asctime)s %(message)s'
-formatter = logging.Formatter(FORMAT)
-handler = logging.StreamHandler()
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+CHECKPOINT_DESCRIPTION = "Bulk load {checkpoint}, batch {batch} of size {batch_size}"
+GEOJSON_DATATYPE = "geojson-feature-collection"
 
 def temp_get_restricted_users(resource): # RMV
-    logging.error("Resource")
+    logger.debug("Skipping restricted users for resource %s", resource.pk)
     restrictions = {}
     restrictions["cannot_read"] = []
     restrictions["cannot_write"] = []
@@ -132,12 +134,52 @@ def get_root_ontology(graph_id):
     return root_ontology_class
 resource_module.Resource.get_root_ontology = temp_get_root_ontology
 
+def completed_batches(checkpoint: str, batch_size: int, indexed: bool = False) -> set[int]:
+    """Batches of a checkpointed bulk load that have already been written, and, if `indexed`, indexed.
+
+    Raises a RuntimeError if the checkpoint was written with another batch
+    size, as its batch numbers would then refer to different field sets.
+    """
+
+    prefix = CHECKPOINT_DESCRIPTION.split("{batch}")[0].format(checkpoint=checkpoint)
+    pattern = re.compile(r"(\d+) of size (\d+)")
+    descriptions = LoadEvent.objects.filter(
+        load_description__startswith=prefix,
+        status__in=("indexed",) if indexed else ("completed", "indexed"),
+    ).values_list("load_description", flat=True)
+    batches = set()
+    for description in descriptions:
+        if not (match := pattern.fullmatch(description[len(prefix):])):
+            continue
+        if int(match[2]) != batch_size:
+            raise RuntimeError(
+                f"Checkpoint {checkpoint} was loaded in batches of {match[2]}, not {batch_size}"
+            )
+        batches.add(int(match[1]))
+    return batches
+
+def geojson_nodes(wrapper_classes) -> frozenset[str]:
+    """IDs of the geometry nodes in any of the models."""
+
+    return frozenset(
+        nodeid
+        for wrapper_cls in wrapper_classes
+        for nodeid, datatype in wrapper_cls._node_datatypes().items()
+        if datatype == GEOJSON_DATATYPE
+    )
+
 class BulkImportWKRM(BaseImportModule):
     moduleid = "a6af3a25-50ac-47a1-a876-bcb13dab411b"
     loadid = None
+    staging_rows_per_second = None
 
-    def __init__(self, request=None):
-        pass
+    def __init__(self, request=None, load_description=None, report=None):
+        from arches_orm.adapter import get_adapter
+
+        self.load_description = load_description
+        self.report = report if report is not None else LoadReport()
+        if self.report.sink is None:
+            self.report.sink = get_adapter("arches-django").config.get("load_timing_sink")
 
     def validate(self):
         """
@@ -150,7 +192,7 @@ class BulkImportWKRM(BaseImportModule):
             rows = cursor.fetchall()
         return {"success": True, "data": rows}
 
-    def write(self, requested_wkrms, do_index=True):
+    def write(self, requested_wkrms, do_index=True, processes=None):
         self.loadid = str(uuid.uuid4()) # f"graphql_bulk_{int(time_mod.time())}"
         user_id = context.data["user"].id
 
@@ -160,15 +202,7 @@ class BulkImportWKRM(BaseImportModule):
             all_wkrms = [relationships] + all_wkrms
 
         all_wkrm_classes = list({wkrm[1]._wkrm for wkrms in all_wkrms for wkrm in wkrms})
-        mapping_details = [
-            {"mapping": {k: str(v) for k, v in wkrm.nodes.items()}, "wkrmClassName": wkrm.model_class_name, "graph": wkrm.graphid}
-            for wkrm in all_wkrm_classes
-        ]
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """INSERT INTO load_event (loadid, complete, status, etl_module_id, load_details, load_start_time, user_id) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (self.loadid, False, "running", self.moduleid, json.dumps(mapping_details), datetime.now(), user_id),
-            )
+        self._start_load(all_wkrm_classes, user_id)
 
         crosses = []
         new_wkrms = []
@@ -210,67 +244,265 @@ class BulkImportWKRM(BaseImportModule):
                         }
                     )
 
-        # transaction_id = uuid.uuid1()
-        with transaction.atomic():
-            bypass = system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION
-            system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = True
+        tiles = []
+        for wkrm in new_wkrms:
+            resource = wkrm.resource
+            resource.tiles = resource.get_flattened_tiles()
+            tiles.extend([(wkrm, tile) for tile in resource.tiles])
+
+        tiles_staging = []
+        for wkrm, tile in tiles:
+            nodes = [
+                (node, {
+                    "value": value,
+                    "valid": True, # FIXME: validate
+                    "source": value, # FIXME: needs source value
+                    "notes": "",
+                    "datatype": "", # FIXME: get datatype
+                }) for node, value in tile.data.items()
+            ]
+            assert len(nodes) == len({n for n, _ in nodes})
+            tiles_staging.append((wkrm, tile, dict(nodes)))
+
+        depths = tile_depths({
+            str(tile.tileid): str(tile.parenttile_id) if tile.parenttile_id else None
+            for _, tile in tiles
+        })
+        staging_rows = (
+            StagingRow(
+                nodegroupid=tile.nodegroup_id,
+                legacyid=wkrm.id,
+                resourceid=wkrm.id,
+                tileid=tile.tileid,
+                parenttileid=tile.parenttile_id,
+                value=tile_data,
+                nodegroup_depth=depths[str(tile.tileid)],
+                source_description=f"GraphQL {wkrm._wkrm}:bulk_create>{wkrm}",
+                operation="insert",
+                passes_validation=True,
+            )
+            for wkrm, tile, tile_data in tiles_staging
+        )
+        geometry_nodes = geojson_nodes({type(wkrm) for wkrm in new_wkrms})
+        if (failure := self._load(staging_rows, CrossChanges(inserts=crosses), geometry_nodes=geometry_nodes)) is not None:
+            return failure
 
-            # Resource.bulk_save([wkrm.resource for wkrm in new_wkrms], transaction_id=transaction_id)
+        if do_index:
+            self._index([
+                (wkrm.resource, wkrm) for wkrm in new_wkrms
+            ], fetch_tiles=False, processes=processes)
+        else:
+            logger.info("Not indexing load %s", self.loadid)
+
+        # Note that the tiles MAY HAVE CHANGED (see EDTFDataType.append_to_document) as
+        # a result of indexing, so should not be subsequently saved
+        return [wkrm for _, wkrm, _ in requested_wkrms]
+
+    def write_records(self, records, do_index=True, processes=None):
+        """Load resources already reduced to plain records, e.g. by worker processes."""
 
-            tiles = []
-            for wkrm in new_wkrms:
-                resource = wkrm.resource
-                resource.tiles = resource.get_flattened_tiles()
-                tiles.extend([(wkrm, tile) for tile in resource.tiles])
+        from arches_orm.wkrm import get_well_known_resource_model_by_graph_id
 
-            tiles_staging = []
-            for wkrm, tile in tiles:
-                nodes = [
-                    (node, {
+        self.loadid = str(uuid.uuid4())
+        user_id = context.data["user"].id
+        wrappers = {
+            record.graphid: get_well_known_resource_model_by_graph_id(record.graphid)._
+            for record in records
+        }
+        self._start_load([wrapper._wkrm for wrapper in wrappers.values()], user_id)
+
+        now = datetime.now()
+        crosses = [
+            ResourceXResource(
+                resourcexid=cross.resourcexid,
+                resourceinstanceidfrom_id=record.resourceid,
+                resourceinstanceidto_id=cross.resourceid,
+                resourceinstancefrom_graphid_id=record.graphid,
+                resourceinstanceto_graphid_id=cross.graphid,
+                tileid_id=cross.tileid,
+                nodeid_id=cross.nodeid,
+                created=now,
+                modified=now,
+            )
+            for record in records
+            for cross in record.crosses
+        ]
+        depths = tile_depths({
+            tile.tileid: tile.parenttileid
+            for record in records
+            for tile in record.tiles
+        })
+        staging_rows = (
+            StagingRow(
+                nodegroupid=tile.nodegroupid,
+                legacyid=record.resourceid,
+                resourceid=record.resourceid,
+                tileid=tile.tileid,
+                parenttileid=tile.parenttileid,
+                value={
+                    node: {
                         "value": value,
-                        "valid": True, # FIXME: validate
-                        "source": value, # FIXME: needs source value
+                        "valid": True,
+                        "source": value,
                         "notes": "",
-                        "datatype": "", # FIXME: get datatype
-                    }) for node, value in tile.data.items()
-                ]
-                assert len(nodes) == len({n for n, _ in nodes})
-                tiles_staging.append((wkrm, tile, dict(nodes)))
+                        "datatype": "",
+                    } for node, value in tile.data.items()
+                },
+                nodegroup_depth=depths[tile.tileid],
+                source_description=f"GraphQL {record.model_class_name}:bulk_create>{record.resourceid}",
+                operation="insert",
+                passes_validation=True,
+            )
+            for record in records
+            for tile in record.tiles
+        )
+        geometry_nodes = geojson_nodes(wrappers.values())
+        if (failure := self._load(staging_rows, CrossChanges(inserts=crosses), geometry_nodes=geometry_nodes)) is not None:
+            return failure
 
-            with connection.cursor() as cursor:
-                for wkrm, tile, tile_data in tiles_staging:
-                    tile_value_json = JSONSerializer().serialize(tile_data)
-                    cursor.execute(
-                        """
-                        INSERT INTO load_staging (
-                            nodegroupid,
-                            legacyid,
-                            resourceid,
-                            tileid,
-                            value,
-                            loadid,
-                            nodegroup_depth,
-                            source_description,
-                            operation,
-                            passes_validation
-                        ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
-                        (
-                            tile.nodegroup_id,
-                            wkrm.id,
-                            wkrm.id,
-                            tile.tileid,
-                            tile_value_json,
-                            self.loadid,
-                            0,
-                            f"GraphQL {wkrm._wkrm}:bulk_create>{wkrm}",
-                            "insert",
-                            True,
-                        ),
-                    )
-                cursor.execute("""CALL __arches_check_tile_cardinality_violation_for_load(%s)""", [self.loadid])
+        if do_index:
+            resources = Resource.objects.filter(
+                resourceinstanceid__in=[record.resourceid for record in records]
+            )
+            self._index([
+                (resource, wrappers[str(resource.graph_id)]) for resource in resources
+            ], fetch_tiles=True, processes=processes)
+        else:
+            logger.info("Not indexing load %s", self.loadid)
+        return [record.resourceid for record in records]
 
-        validation = self.validate()
-        logger.error("%s Validated", str(datetime.now()))
+    def write_updates(self, pending_saves, changes, do_index=True):
+        """Load the changed tiles of existing resources, prepared for saving, as updates.
+
+        Tiles that were removed, and relationships that were added or removed,
+        are written once the tiles have been. Descriptors are recalculated from
+        the stored tiles, which are then indexed.
+        """
+
+        self.loadid = str(uuid.uuid4())
+        user_id = context.data["user"].id
+        self._start_load(list({pending.wkri._wkrm for pending in pending_saves}), user_id)
+
+        tiles = []
+        for pending in pending_saves:
+            for tile in pending.resource.tiles:
+                if pending.wkri._tile_has_changed(tile):
+                    if not tile.tileid:
+                        tile.tileid = uuid.uuid4()
+                    tiles.append((pending.wkri, tile))
+        depths = tile_depths({
+            str(tile.tileid): str(tile.parenttile_id) if tile.parenttile_id else None
+            for _, tile in tiles
+        })
+        staging_rows = (
+            StagingRow(
+                nodegroupid=tile.nodegroup_id,
+                legacyid=wkri.id,
+                resourceid=wkri.id,
+                tileid=tile.tileid,
+                parenttileid=tile.parenttile_id,
+                value={
+                    node: {
+                        "value": value,
+                        "valid": True,
+                        "source": value,
+                        "notes": "",
+                        "datatype": "",
+                    } for node, value in (tile.data or {}).items()
+                },
+                nodegroup_depth=depths[str(tile.tileid)],
+                source_description=f"GraphQL {wkri._wkrm}:bulk_update>{wkri}",
+                operation="update",
+                passes_validation=True,
+            )
+            for wkri, tile in tiles
+        )
+        deleted_tiles = [
+            tile.tileid
+            for pending in pending_saves
+            for tile in pending.ghost_tiles
+        ]
+        geometry_nodes = geojson_nodes({type(pending.wkri) for pending in pending_saves})
+        if (failure := self._load(
+            staging_rows, changes, deleted_tiles=deleted_tiles, geometry_nodes=geometry_nodes
+        )) is not None:
+            return failure
+
+        for _wkri, tile in tiles:
+            tile._state.adding = False
+            tile._original_data = deepcopy(tile.data)
+
+        resourceids = [pending.resource.resourceinstanceid for pending in pending_saves]
+        resources = {
+            resource.resourceinstanceid: resource
+            for resource in fetch_resources_with_tiles(resourceids)
+        }
+        # Older versions of Arches calculate descriptors on demand instead.
+        with self.report.span("descriptors", rows=len(resources)):
+            for resource in resources.values():
+                if hasattr(resource, "save_descriptors"):
+                    resource.save_descriptors()
+        for pending in pending_saves:
+            pending.wkri.resource = resources[pending.resource.resourceinstanceid]
+
+        if do_index:
+            self._index([
+                (pending.wkri.resource, pending.wkri) for pending in pending_saves
+            ], fetch_tiles=False)
+        else:
+            logger.info("Not indexing load %s", self.loadid)
+        return [str(resourceid) for resourceid in resourceids]
+
+    def _start_load(self, wkrm_classes, user_id):
+        self.report.loadid = self.loadid
+        mapping_details = [
+            {"mapping": {k: str(v) for k, v in wkrm.nodes.items()}, "wkrmClassName": wkrm.model_class_name, "graph": wkrm.graphid}
+            for wkrm in wkrm_classes
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """INSERT INTO load_event (loadid, complete, status, etl_module_id, load_description, load_details, load_start_time, user_id) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+                (self.loadid, False, "running", self.moduleid, self.load_description, json.dumps(mapping_details), datetime.now(), user_id),
+            )
+
+    def _load(self, staging_rows, crosses, deleted_tiles=(), geometry_nodes=frozenset()):
+        """Stage, validate and write tiles, then remove tiles and update relationships.
+
+        Returns None if this succeeded, otherwise the result to give back to the caller.
+        """
+
+        # transaction_id = uuid.uuid1()
+        bypass = system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION
+        system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = True
+        try:
+            return self._stage_and_write(staging_rows, crosses, deleted_tiles, geometry_nodes)
+        finally:
+            system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = bypass
+
+    def _stage_and_write(self, staging_rows, crosses, deleted_tiles=(), geometry_nodes=frozenset()):
+        # Geometries only need refreshing for tiles with geometry nodes.
+        staged_geometry_nodes = set()
+
+        def _noting_geometries(rows):
+            for row in rows:
+                staged_geometry_nodes.update(geometry_nodes.intersection(row.value))
+                yield row
+
+        staging_rows = _noting_geometries(staging_rows)
+        with transaction.atomic():
+            # Resource.bulk_save([wkrm.resource for wkrm in new_wkrms], transaction_id=transaction_id)
+
+            with connection.cursor() as cursor:
+                with self.report.span("staging") as span:
+                    staging_writer = StagingWriter(cursor, self.loadid)
+                    span.rows = staging_writer.write(staging_rows)
+                self.staging_rows_per_second = staging_writer.rows_per_second
+                with self.report.span("cardinality"):
+                    cursor.execute("""CALL __arches_check_tile_cardinality_violation_for_load(%s)""", [self.loadid])
+
+        with self.report.span("validation") as span:
+            validation = self.validate()
+            span.rows = len(validation["data"])
         if len(validation["data"]) != 0:
             with connection.cursor() as cursor:
                 cursor.execute(
@@ -281,17 +513,21 @@ class BulkImportWKRM(BaseImportModule):
         else:
             try:
                 with connection.cursor() as cursor:
-                    logger.error("%s Disabling regular triggers", str(datetime.now()))
-                    cursor.execute("""CALL __arches_prepare_bulk_load();""", [self.loadid])
-                    logger.error("%s Staging to tile [start]", str(datetime.now()))
-                    cursor.execute("""SELECT * FROM __arches_staging_to_tile(%s)""", [self.loadid])
-                    logger.error("%s Retrieving result", str(datetime.now()))
-                    row = cursor.fetchall()
-                    logger.error("%s Refreshing geometries", str(datetime.now()))
-                    cursor.execute("""SELECT * FROM refresh_geojson_geometries();""", [self.loadid])
-                    logger.error("%s Re-enabling regular triggers", str(datetime.now()))
-                    cursor.execute("""CALL __arches_complete_bulk_load();""", [self.loadid])
-                    logger.error("%s Bulk load complete", str(datetime.now()))
+                    with self.report.span("prepare_bulk_load"):
+                        cursor.execute("""CALL __arches_prepare_bulk_load();""", [self.loadid])
+                    with self.report.span("staging_to_tile"):
+                        cursor.execute("""SELECT * FROM __arches_staging_to_tile(%s)""", [self.loadid])
+                        row = cursor.fetchall()
+                    if staged_geometry_nodes:
+                        with self.report.span("geometries") as span:
+                            cursor.execute(
+                                """SELECT refresh_tile_geojson_geometries(tileid) FROM load_staging
+                                WHERE loadid = %s AND passes_validation AND value ?| %s""",
+                                [self.loadid, sorted(staged_geometry_nodes)],
+                            )
+                            span.rows = cursor.rowcount
+                    with self.report.span("complete_bulk_load"):
+                        cursor.execute("""CALL __arches_complete_bulk_load();""", [self.loadid])
             except (IntegrityError, ProgrammingError) as e:
                 logger.error(e)
                 with connection.cursor() as cursor:
@@ -306,7 +542,6 @@ class BulkImportWKRM(BaseImportModule):
                     "message": _("Unable to insert record into staging table"),
                 }
 
-        logger.error("%s Loading event completed", str(datetime.now()))
         if row[0][0]:
             with connection.cursor() as cursor:
                 cursor.execute(
@@ -322,100 +557,20 @@ class BulkImportWKRM(BaseImportModule):
                     ("failed", datetime.now(), self.loadid),
                 )
             return []
-            #Resource.objects.bulk_create(resources)
-            #TileModel.objects.bulk_create(tiles)
-            #for resource in resources:
-            #    resource.save_edit(edit_type="create", transaction_id=transaction_id)
-
-            #resources[0].tiles[0].save_edit(
-            #    note=f"Bulk created: {len(tiles)} for {len(resources)} resources.", edit_type="bulk_create", transaction_id=transaction_id
-            #)
-
-            #print("Time to save resource edits: %s" % datetime.timedelta(seconds=time() - start))
-
-            #for resource in resources:
-            #    start = time()
-            #    document, terms = resource.get_documents_to_index(
-            #        fetchTiles=False, datatype_factory=datatype_factory, node_datatypes=node_datatypes
-            #    )
-
-            #    documents.append(se.create_bulk_item(index=RESOURCES_INDEX, id=document["resourceinstanceid"], data=document))
-
-            #    for term in terms:
-            #        term_list.append(se.create_bulk_item(index=TERMS_INDEX, id=term["_id"], data=term["_source"]))
-
-            #se.bulk_index(documents)
-            #se.bulk_index(term_list)
-            #
-            #TODO loadid = int(time.time())
-            #TODO for tile in tiles:
-            #TODO     cursor.execute(
-            #TODO         """
-            #TODO         INSERT INTO load_staging (
-            #TODO             nodegroupid,
-            #TODO             legacyid,
-            #TODO             resourceid,
-            #TODO             tileid,
-            #TODO             value,
-            #TODO             loadid,
-            #TODO             nodegroup_depth,
-            #TODO             source_description,
-            #TODO             passes_validation
-            #TODO         ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
-            #TODO         (
-            #TODO             nodegroup,
-            #TODO             legacyid,
-            #TODO             resourceid,
-            #TODO             tileid,
-            #TODO             tile_value_json,
-            #TODO             loadid,
-            #TODO             node_depth,
-            #TODO             csv_file_name,
-            #TODO             passes_validation,
-            #TODO         ),
-            #TODO     )
-
-            #TODO cursor.execute("""CALL __arches_check_tile_cardinality_violation_for_load(%s)""", [loadid])
-        logger.error("%s Loading event marked", str(datetime.now()))
-
-        logger.error("%s Adding relationships [%d]", str(datetime.now()), len(crosses))
-        if crosses:
-            ResourceXResource.objects.bulk_create(crosses)
-        logger.error("%s Added relationships", str(datetime.now()))
+        if deleted_tiles:
+            with self.report.span("deleted_tiles", rows=len(deleted_tiles)):
+                TileModel.objects.filter(tileid__in=deleted_tiles).delete()
 
-        if do_index:
-            logger.error("%s Indexing", str(datetime.now()))
-            documents = []
-            term_list = []
-            for n, wkrm in enumerate(new_wkrms):
-                logger.error("%s : WKRM %d", str(datetime.now()), n)
-                resource = wkrm.resource
-                datatype_factory = wkrm._datatype_factory()
-                node_datatypes = wkrm._node_datatypes()
-                logger.error("%s : (fetching)", str(datetime.now()))
-                document, terms = resource.get_documents_to_index(
-                    fetchTiles=False, datatype_factory=datatype_factory, node_datatypes=node_datatypes
-                )
-                logger.error("%s : (fetched)", str(datetime.now()))
-                documents.append(se.create_bulk_item(index=RESOURCES_INDEX, id=document["resourceinstanceid"], data=document))
-                logger.error("%s : (document appended)", str(datetime.now()))
+        with self.report.span("crosses", rows=len(crosses.inserts) + len(crosses.deletes)):
+            crosses.apply()
 
-                for term in terms:
-                    term_list.append(se.create_bulk_item(index=TERMS_INDEX, id=term["_id"], data=term["_source"]))
+        return None
 
-            logger.error("%s Index document compiled", str(datetime.now()))
-            se.bulk_index(documents)
-            se.bulk_index(term_list)
-            with connection.cursor() as cursor:
-                cursor.execute(
-                    """UPDATE load_event SET (status, indexed_time, complete, successful) = (%s, %s, %s, %s) WHERE loadid = %s""",
-                    ("indexed", datetime.now(), True, True, self.loadid),
-                )
-            logger.error("%s Indexed", str(datetime.now()))
-        else:
-            logger.error("%s Not indexing", str(datetime.now()))
-        system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = bypass
-
-        # Note that the tiles MAY HAVE CHANGED (see EDTFDataType.append_to_document) as
-        # a result of indexing, so should not be subsequently saved
-        return [wkrm for _, wkrm, _ in requested_wkrms]
+    def _index(self, resources_and_wrappers, fetch_tiles=False, processes=None):
+        with self.report.span("indexing") as span:
+            span.rows = index_resources(resources_and_wrappers, fetch_tiles=fetch_tiles, processes=processes)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """UPDATE load_event SET (status, indexed_time, complete, successful) = (%s, %s, %s, %s) WHERE loadid = %s""",
+                ("indexed", datetime.now(), True, True, self.loadid),
+            )
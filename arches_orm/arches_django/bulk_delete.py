@@ -0,0 +1,129 @@
+"""Deleting many resources at once, with set-based SQL.
+
+Deleting resources one at a time removes each tile and relationship in turn,
+with hooks and deindexing for every one. Here, all the rows for a set of
+resources are removed with a handful of statements in one transaction, and
+their search documents with one delete-by-query.
+"""
+
+import uuid
+import logging
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from guardian.models import GroupObjectPermission, UserObjectPermission
+from arches.app.models.models import ResourceInstance
+from arches.app.models.resource import Resource
+from arches.app.models.system_settings import settings as system_settings
+from arches.app.search.elasticsearch_dsl_builder import Bool, Query, Terms
+from arches.app.search.mappings import RESOURCES_INDEX, TERMS_INDEX
+from arches.app.search.search_engine_factory import SearchEngineInstance
+from arches.app.utils import import_class_from_string
+
+logger = logging.getLogger(__name__)
+
+
+def _strip_references(cursor, resourceids: list[str]) -> set[str]:
+    """Remove references to the resources from the tiles of other resources, returning those resources."""
+
+    cursor.execute(
+        """SELECT DISTINCT resourceinstanceidfrom, nodeid FROM resource_x_resource
+        WHERE resourceinstanceidto = ANY(%(ids)s::uuid[])
+        AND NOT resourceinstanceidfrom = ANY(%(ids)s::uuid[])
+        AND tileid IS NOT NULL AND nodeid IS NOT NULL""",
+        {"ids": resourceids},
+    )
+    references = cursor.fetchall()
+
+    # As when deleting a single resource, the node is left holding a list.
+    for nodeid in {str(nodeid) for _, nodeid in references}:
+        cursor.execute(
+            """UPDATE tiles SET tiledata = jsonb_set(tiledata, ARRAY[%(nodeid)s], COALESCE((
+                SELECT jsonb_agg(item) FROM jsonb_array_elements(
+                    CASE jsonb_typeof(tiledata -> %(nodeid)s)
+                        WHEN 'array' THEN tiledata -> %(nodeid)s
+                        ELSE jsonb_build_array(tiledata -> %(nodeid)s)
+                    END
+                ) AS item
+                WHERE item ->> 'resourceId' <> ALL(%(ids)s::text[])
+            ), '[]'::jsonb))
+            WHERE tileid IN (
+                SELECT tileid FROM resource_x_resource
+                WHERE nodeid = %(nodeid)s::uuid
+                AND resourceinstanceidto = ANY(%(ids)s::uuid[])
+                AND NOT resourceinstanceidfrom = ANY(%(ids)s::uuid[])
+            )""",
+            {"ids": resourceids, "nodeid": nodeid},
+        )
+    return {str(resourceid) for resourceid, _ in references}
+
+
+def delete_resources(resourceids: list[str], user=None) -> tuple[list[str], set[str]]:
+    """Delete resources, with their tiles, relationships and permissions, in one transaction.
+
+    Returns the IDs of the resources that existed, and so were deleted, and of
+    any other resources whose tiles referred to them, which have been updated.
+    """
+
+    transaction_id = str(uuid.uuid4())
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """SELECT resourceinstanceid FROM resource_instances WHERE resourceinstanceid = ANY(%s::uuid[])""",
+            [[str(resourceid) for resourceid in resourceids]],
+        )
+        resourceids = [str(resourceid) for resourceid, in cursor.fetchall()]
+        if not resourceids:
+            return [], set()
+
+        referring = _strip_references(cursor, resourceids)
+        cursor.execute(
+            """INSERT INTO edit_log (resourceclassid, resourceinstanceid, edittype, userid, timestamp, note, transactionid)
+            SELECT graphid::text, resourceinstanceid::text, 'delete', %s, now(), 'bulk deleted', %s
+            FROM resource_instances WHERE resourceinstanceid = ANY(%s::uuid[])""",
+            [str(getattr(user, "id", "")), transaction_id, resourceids],
+        )
+        cursor.execute(
+            """DELETE FROM resource_x_resource
+            WHERE resourceinstanceidfrom = ANY(%(ids)s::uuid[]) OR resourceinstanceidto = ANY(%(ids)s::uuid[])""",
+            {"ids": resourceids},
+        )
+        cursor.execute(
+            """DELETE FROM geojson_geometries WHERE resourceinstanceid = ANY(%s::uuid[])""",
+            [resourceids],
+        )
+        cursor.execute(
+            """DELETE FROM files WHERE tileid IN (
+                SELECT tileid FROM tiles WHERE resourceinstanceid = ANY(%s::uuid[])
+            )""",
+            [resourceids],
+        )
+        cursor.execute("""DELETE FROM tiles WHERE resourceinstanceid = ANY(%s::uuid[])""", [resourceids])
+        cursor.execute("""DELETE FROM resource_instances WHERE resourceinstanceid = ANY(%s::uuid[])""", [resourceids])
+        # Instance permissions refer to resources by primary key, so are not removed with them.
+        content_type = ContentType.objects.get_for_model(ResourceInstance)
+        for permission_model in (UserObjectPermission, GroupObjectPermission):
+            permission_model.objects.filter(content_type=content_type, object_pk__in=resourceids).delete()
+
+    logger.info("Deleted %d resources, updating references from %d others", len(resourceids), len(referring))
+    return resourceids, referring - set(resourceids)
+
+
+def deindex_resources(resourceids: list[str], referring: set[str] = frozenset()) -> None:
+    """Remove resources from the search indexes, and reindex those that referred to them."""
+
+    if not resourceids:
+        return
+
+    query = Query(SearchEngineInstance)
+    bool_query = Bool()
+    bool_query.filter(Terms(field="resourceinstanceid", terms=resourceids))
+    query.add_query(bool_query)
+    query.delete(index=f"{RESOURCES_INDEX},{TERMS_INDEX}")
+
+    for index in system_settings.ELASTICSEARCH_CUSTOM_INDEXES:
+        es_index = import_class_from_string(index["module"])(index["name"])
+        es_index.delete_resources(resources=[
+            ResourceInstance(resourceinstanceid=resourceid) for resourceid in resourceids
+        ])
+
+    for resource in Resource.objects.filter(resourceinstanceid__in=list(referring)):
+        resource.index()
@@ -0,0 +1,142 @@
+"""Building bulk-load records for well-known resources in worker processes.
+
+Constructing a resource from field values walks the pseudo-node machinery and
+datatype register for every field, which is CPU-bound. For large loads, the
+field sets may be split across a process pool, where each worker reduces its
+resources to plain, picklable records of tiles and relationships. The parent
+process then stages all the records as one load.
+"""
+
+import uuid
+import logging
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+from django.db import connection, connections
+
+from arches_orm.adapter import get_adapter
+
+from .permission_view import PermissionView
+
+logger = logging.getLogger(__name__)
+
+BULK_RECORDS_CHUNK_SIZE = 100
+
+
+class TileRecord(NamedTuple):
+    nodegroupid: str
+    tileid: str
+    parenttileid: str | None
+    data: dict[str, Any]
+
+
+class CrossRecord(NamedTuple):
+    resourcexid: str
+    resourceid: str
+    graphid: str
+    tileid: str
+    nodeid: str
+
+
+@dataclass
+class BulkResourceRecord:
+    resourceid: str
+    graphid: str
+    model_class_name: str
+    tiles: list[TileRecord] = field(default_factory=list)
+    crosses: list[CrossRecord] = field(default_factory=list)
+
+    @classmethod
+    def from_wkri(cls, wkri, permissions: PermissionView | None = None) -> "BulkResourceRecord":
+        """Reduce a well-known resource, built but not saved, to a record."""
+
+        resource = wkri.resource
+        record = cls(
+            resourceid=str(resource.resourceinstanceid),
+            graphid=str(wkri.graphid),
+            model_class_name=wkri._wkrm.model_class_name,
+        )
+        related_graphs = {
+            str(related.id): str(related._.graphid)
+            for _, related, _ in (wkri._pending_relationships or [])
+        }
+        for tile in resource.get_flattened_tiles():
+            if permissions is not None and not permissions.can_write(tile.nodegroup_id):
+                raise RuntimeError(f"Attempt to modify data that this user does not have permissions to: {tile.nodegroup_id} in {wkri}")
+            for nodeid, value in (tile.data or {}).items():
+                entries = value if isinstance(value, list) else [value]
+                for entry in entries:
+                    if (
+                        isinstance(entry, dict)
+                        and (graphid := related_graphs.get(str(entry.get("resourceId"))))
+                        and not entry.get("resourceXresourceId")
+                    ):
+                        entry["resourceXresourceId"] = str(uuid.uuid4())
+                        record.crosses.append(CrossRecord(
+                            resourcexid=entry["resourceXresourceId"],
+                            resourceid=str(entry["resourceId"]),
+                            graphid=graphid,
+                            tileid=str(tile.tileid),
+                            nodeid=str(nodeid),
+                        ))
+            record.tiles.append(TileRecord(
+                nodegroupid=str(tile.nodegroup_id),
+                tileid=str(tile.tileid),
+                parenttileid=str(tile.parenttile_id) if tile.parenttile_id else None,
+                data=tile.data or {},
+            ))
+        return record
+
+
+def _build_records(model_class_name: str, field_sets: list[dict], permissions: PermissionView | None):
+    from arches_orm.wkrm import get_well_known_resource_model_by_class_name
+
+    # Permissions were checked by the parent process, which passes on its view
+    # of the nodegroups that may be written.
+    with get_adapter("arches-django").context_free():
+        model = get_well_known_resource_model_by_class_name(model_class_name)
+        return [
+            BulkResourceRecord.from_wkri(
+                model.create(_no_save=True, **field_set)._,
+                permissions,
+            )
+            for field_set in field_sets
+        ]
+
+
+def build_records_in_pool(
+    wrapper_cls,
+    fields: list[dict],
+    processes: int,
+    chunk_size: int = BULK_RECORDS_CHUNK_SIZE,
+) -> list[BulkResourceRecord]:
+    """Build records for field sets across a pool of forked worker processes.
+
+    This cannot be done inside a transaction, as the parent's database
+    connections are closed before forking, which would abandon it.
+    """
+
+    if connection.in_atomic_block:
+        raise RuntimeError(
+            "Cannot build records in worker processes inside a transaction,"
+            " as database connections are closed before forking"
+        )
+
+    permissions = wrapper_cls._permission_view()
+    # Workers are forked, so share anything cached here, but must not share
+    # database connections.
+    wrapper_cls._node_objects()
+    wrapper_cls._nodegroup_objects()
+    connections.close_all()
+
+    chunks = [fields[n:n + chunk_size] for n in range(0, len(fields), chunk_size)]
+    logger.info(
+        "Building %d resources in %d chunks across %d processes",
+        len(fields), len(chunks), processes
+    )
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        results = pool.starmap(
+            _build_records,
+            [(wrapper_cls._wkrm.model_class_name, chunk, permissions) for chunk in chunks],
+        )
+    return [record for records in results for record in records]
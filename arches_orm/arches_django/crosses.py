@@ -0,0 +1,165 @@
+"""Reconciliation of resource-to-resource relationships for a batch of saves.
+
+Rather than querying and saving the crosses of each resource as it is saved,
+the existing crosses of a whole batch are fetched at once, compared with the
+related values in the tiles being saved, and the differences written with a
+single bulk insert and a single bulk delete.
+"""
+
+import uuid
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from arches.app.models.models import ResourceXResource
+from arches.app.models.resource import Resource
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingSave:
+    """A well-known resource whose Arches resource has been built, but not yet written."""
+
+    wkri: Any
+    resource: Resource
+    tiles: dict[str, list]
+    relationships: list[tuple]
+    ghost_tiles: set
+    is_new: bool
+    save_changed_only: bool
+    no_save: bool
+
+
+@dataclass
+class CrossChanges:
+    inserts: list[ResourceXResource] = field(default_factory=list)
+    deletes: list[ResourceXResource] = field(default_factory=list)
+
+    def apply(self) -> None:
+        if self.deletes:
+            ResourceXResource.objects.filter(
+                resourcexid__in=[cross.resourcexid for cross in self.deletes]
+            ).delete()
+        if self.inserts:
+            ResourceXResource.objects.bulk_create(self.inserts)
+
+
+def _related_ids(value) -> set[str]:
+    if not value:
+        return set()
+    if not isinstance(value, list):
+        value = [value]
+    return {
+        str(entry["resourceId"])
+        for entry in value
+        if isinstance(entry, dict) and entry.get("resourceId")
+    }
+
+
+def reconcile_crosses(
+    pending_saves: list[PendingSave],
+    save_crosses: bool,
+    save_related_if_missing: bool = True,
+) -> CrossChanges:
+    """Fill in related values for a batch of resources, and find the crosses to add or remove.
+
+    Crosses are only added or removed if `save_crosses` is set, otherwise, as
+    before, new relationships are left pending on each well-known resource.
+    """
+
+    changes = CrossChanges()
+
+    existing_crosses: dict[str, list[ResourceXResource]] = {}
+    resourceids = [
+        pending.resource.resourceinstanceid
+        for pending in pending_saves
+        if not pending.is_new
+    ]
+    if resourceids:
+        for cross in ResourceXResource.objects.filter(resourceinstanceidfrom_id__in=resourceids):
+            existing_crosses.setdefault(str(cross.resourceinstanceidfrom_id), [])
+            existing_crosses[str(cross.resourceinstanceidfrom_id)].append(cross)
+
+    now = datetime.now()
+    for pending in pending_saves:
+        resource = pending.resource
+        save_crosses_here = save_crosses and not pending.no_save
+        crosses = existing_crosses.get(str(resource.resourceinstanceid), [])
+        matched = set()
+        for tile_ix, nodegroup_id, nodeid, related in pending.relationships:
+            tile = pending.tiles[nodegroup_id][tile_ix]
+            value = tile.data[nodeid]
+            if not related.id:
+                if save_related_if_missing:
+                    related.save()
+                else:
+                    logger.warning("Not saving a related model as not requested")
+                    continue
+
+            # Crosses made before they were linked to tiles are matched on the related resource alone.
+            cross = next((
+                cross for cross in crosses
+                if cross.resourcexid not in matched
+                and str(cross.resourceinstanceidto_id) == str(related.id)
+                and (cross.tileid_id is None or str(cross.tileid_id) == str(tile.tileid))
+            ), None)
+            cross_resourcexid = None
+            if cross is not None:
+                matched.add(cross.resourcexid)
+                cross_resourcexid = str(cross.resourcexid)
+            elif save_crosses_here:
+                cross = ResourceXResource(
+                    resourcexid=uuid.uuid4(),
+                    resourceinstanceidfrom_id=resource.resourceinstanceid,
+                    resourceinstanceidto_id=related.id,
+                    resourceinstancefrom_graphid_id=resource.graph_id,
+                    resourceinstanceto_graphid_id=related._.graphid,
+                    tileid_id=tile.tileid,
+                    nodeid_id=nodeid,
+                    created=now,
+                    modified=now,
+                )
+                changes.inserts.append(cross)
+                cross_resourcexid = str(cross.resourcexid)
+            else:
+                pending.wkri._pending_relationships.append((value, related, pending.wkri))
+
+            cross_value = {
+                "resourceId": str(related.id),
+                "ontologyProperty": "",
+                "resourceXresourceId": cross_resourcexid,
+                "inverseOntologyProperty": "",
+            }
+            if isinstance(value, list):
+                entry = next((
+                    entry for entry in value
+                    if (entry["resourceId"] == cross_value["resourceId"]) or
+                    (
+                        entry["resourceXresourceId"] is not None and
+                        entry["resourceXresourceId"] == cross_value["resourceXresourceId"]
+                    )
+                ), None)
+                if entry is None:
+                    value.append(cross_value)
+                elif cross_resourcexid:
+                    entry["resourceXresourceId"] = cross_resourcexid
+            else:
+                value.update(cross_value)
+
+        if save_crosses_here and crosses:
+            # Only crosses for a tile and node whose data no longer refers to the related
+            # resource are removed, as relationships in tiles that were not accessed are
+            # not listed.
+            tiles_by_id = {str(tile.tileid): tile for tile in resource.tiles}
+            for cross in crosses:
+                if cross.resourcexid in matched or not cross.tileid_id or not cross.nodeid_id:
+                    continue
+                if (tile := tiles_by_id.get(str(cross.tileid_id))) is None:
+                    continue
+                if str(cross.resourceinstanceidto_id) not in _related_ids(
+                    (tile.data or {}).get(str(cross.nodeid_id))
+                ):
+                    changes.deletes.append(cross)
+
+    return changes
@@ -80,9 +80,15 @@ def resource_instance(
 
     if not resource_instance:
         if resource_instance_id:
-            resource_instance = attempt_well_known_resource_model(
-                resource_instance_id, from_prefetch=parent_wkri._._related_prefetch
-            )
+            prefetched = parent_wkri._._prefetched if parent_wkri else None
+            if prefetched and str(resource_instance_id) in prefetched:
+                # Already loaded in bulk with its siblings, but each reference
+                # needs its own instance, as it records where it is related from.
+                resource_instance = prefetched[str(resource_instance_id)]()
+            else:
+                resource_instance = attempt_well_known_resource_model(
+                    resource_instance_id, from_prefetch=parent_wkri._._related_prefetch, related=True
+                )
         else:
             return None
 
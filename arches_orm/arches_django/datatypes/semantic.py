@@ -34,8 +34,7 @@ def semantic(
         )
         child._parent_node = svm
         if parent:
-            parent._._values.setdefault(key, [])
-            parent._._values[key].append(child)
+            parent._._values.add(key, child)
         return child
 
     def get_child_values(svm):
@@ -45,10 +44,8 @@ def semantic(
             parent._._values.get(key)
         children = {
             key: value
-            for key, values in parent._._values.items()
-            for value in values
-            if key in child_keys
-            and value is not None
+            for key, value in parent._._values.child_candidates(child_nodes, tile)
+            if value is not None
             and (value._parent_node is None or value._parent_node is svm)
             and (
                 (tile and value.parenttile_id == tile.tileid)
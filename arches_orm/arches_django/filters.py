@@ -148,12 +148,13 @@ class SearchMixin:
 
         # AGPL Arches
         se = SearchEngineFactory().create()
-        permitted_nodegroups = cls._permitted_nodegroups()
-        permitted_nodegroups = [
+        permissions = cls._permission_view()
+        # Only match strings and concepts in nodegroups of this model that the user may read.
+        permitted_nodegroups = sorted({
             str(node.nodegroup_id)
             for key, node in cls._node_objects_by_alias().items()
-            if (fields is None or key in fields) and (node.nodegroup_id is None or node.nodegroup_id in permitted_nodegroups)
-        ]
+            if (fields is None or key in fields) and permissions.can_read(node.nodegroup_id)
+        })
 
         query = Query(se)
         fltr = Bool()
@@ -175,11 +176,17 @@ class SearchMixin:
         for cpt in concept:
             if hasattr(cpt, "conceptid"):
                 cpt = cpt.conceptid
-            ConceptFilter(str(cpt), language=language).build(fltr)
+            concept_filter = ConceptFilter(str(cpt), language=language)
+            concept_filter.override_permitted_nodegroups(permitted_nodegroups)
+            concept_filter.build(fltr)
         for trm in term:
-            TermFilter(str(trm), language=language).build(fltr)
+            term_filter = TermFilter(str(trm), language=language)
+            term_filter.override_permitted_nodegroups(permitted_nodegroups)
+            term_filter.build(fltr)
         for txt in text:
-            StringFilter(str(txt), language=language).build(fltr)
+            string_filter = StringFilter(str(txt), language=language)
+            string_filter.override_permitted_nodegroups(permitted_nodegroups)
+            string_filter.build(fltr)
 
         query.add_query(fltr)
         query.min_score("0.01")
@@ -0,0 +1,200 @@
+"""On-disk cache of graph metadata, to avoid querying it in every worker.
+
+If the adapter config has a `graph_cache_path` (or `ARCHES_ORM_GRAPH_CACHE` is
+set in the environment), nodes, nodegroups and edges are read from that file
+rather than the database, as long as the graph's publication has not changed
+since it was written. The file is written by the `warm_graph_cache` command.
+"""
+
+import os
+import pickle
+import logging
+from pathlib import Path
+from typing import Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from arches.app.models.models import Node, NodeGroup, Edge, GraphModel
+
+from arches_orm.adapter import get_adapter
+
+logger = logging.getLogger(__name__)
+
+GRAPH_CACHE_VERSION = 1
+
+
+@dataclass
+class GraphMetadata:
+    graphid: str
+    publication_id: str | None
+    nodes: dict[str, Node]
+    nodegroups: dict[str, NodeGroup]
+    edge_pairs: list[tuple[str, str]]
+    datatypes: dict[str, str] = field(default_factory=dict)
+    collections: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_database(cls, graphid: str) -> "GraphMetadata":
+        nodes = {str(node.nodeid): node for node in Node.objects.filter(graph_id=graphid)}
+        nodegroups = {
+            str(nodegroup.nodegroupid): nodegroup
+            for nodegroup in NodeGroup.objects.filter(
+                nodegroupid__in=[node.nodegroup_id for node in nodes.values()]
+            )
+        }
+        edge_pairs = [
+            (str(edge.domainnode_id), str(edge.rangenode_id))
+            for edge in Edge.objects.filter(graph_id=graphid)
+        ]
+        return cls(
+            graphid=str(graphid),
+            publication_id=_get_publication_id(graphid),
+            nodes=nodes,
+            nodegroups=nodegroups,
+            edge_pairs=edge_pairs,
+            datatypes={nodeid: node.datatype for nodeid, node in nodes.items()},
+            collections={
+                nodeid: str(node.config["rdmCollection"])
+                for nodeid, node in nodes.items()
+                if node.config and node.config.get("rdmCollection")
+            },
+        )
+
+
+def get_graph_cache_path() -> Path | None:
+    path = get_adapter("arches-django").config.get(
+        "graph_cache_path", os.environ.get("ARCHES_ORM_GRAPH_CACHE")
+    )
+    return Path(path) if path else None
+
+
+def _get_publication_id(graphid: str) -> str | None:
+    publication_id = GraphModel.objects.filter(graphid=graphid).values_list(
+        "publication_id", flat=True
+    ).first()
+    return str(publication_id) if publication_id else None
+
+
+@lru_cache
+def _read_graph_cache(path: Path) -> dict[str, GraphMetadata]:
+    try:
+        with path.open("rb") as cache_f:
+            cache = pickle.load(cache_f)
+    except FileNotFoundError:
+        logger.info("No graph metadata cache at %s", str(path))
+        return {}
+    except Exception as exc:
+        logger.warning("Could not read graph metadata cache at %s: %s", str(path), str(exc))
+        return {}
+    if cache.get("version") != GRAPH_CACHE_VERSION:
+        logger.warning("Ignoring graph metadata cache at %s with old version", str(path))
+        return {}
+    return cache["graphs"]
+
+
+def load_graph_metadata(graphid: str) -> GraphMetadata:
+    """Get metadata for a graph, from the cache if it is current, or the database."""
+
+    if (path := get_graph_cache_path()):
+        metadata = _read_graph_cache(path).get(str(graphid))
+        if metadata is not None:
+            if metadata.publication_id == _get_publication_id(graphid):
+                return metadata
+            logger.info("Graph metadata cache is stale for %s", str(graphid))
+    return GraphMetadata.from_database(graphid)
+
+
+def _split_by_currency(graphids: list[str] | None) -> tuple[list[GraphMetadata], list[str] | None]:
+    """Cached metadata that is current for the graphs, and the IDs of the rest.
+
+    If there is no cache to use, the rest is None when all graphs were asked for.
+    """
+
+    if not (path := get_graph_cache_path()) or not (graphs := _read_graph_cache(path)):
+        return [], graphids
+    publications = GraphModel.objects.values_list("graphid", "publication_id")
+    if graphids is not None:
+        publications = publications.filter(graphid__in=graphids)
+    current, rest = [], []
+    for graphid, publication_id in publications:
+        metadata = graphs.get(str(graphid))
+        if metadata is not None and metadata.publication_id == (str(publication_id) if publication_id else None):
+            current.append(metadata)
+        else:
+            rest.append(str(graphid))
+    return current, rest
+
+
+def _node_values(graphids: list[str] | None, from_metadata, from_nodes) -> dict[str, Any]:
+    current, rest = _split_by_currency(graphids)
+    values = {}
+    for metadata in current:
+        values.update(from_metadata(metadata))
+    if rest is None:
+        values.update(from_nodes(Node.objects.all()))
+    elif rest:
+        logger.info("Graph metadata cache is missing or stale for %d graphs", len(rest))
+        values.update(from_nodes(Node.objects.filter(graph_id__in=rest)))
+    return values
+
+
+def node_datatypes(graphids: list[str] | None = None) -> dict[str, str]:
+    """Datatypes of the nodes of the graphs, or of all graphs, by node ID.
+
+    As for `load_graph_metadata`, the cache is used for graphs where it is
+    current, and the database for any others.
+    """
+
+    return _node_values(
+        graphids,
+        lambda metadata: metadata.datatypes,
+        lambda nodes: {str(nodeid): datatype for nodeid, datatype in nodes.values_list("nodeid", "datatype")},
+    )
+
+
+def node_aliases(graphids: list[str] | None = None) -> dict[str, str]:
+    """Aliases of the nodes of the graphs, or of all graphs, by node ID."""
+
+    return _node_values(
+        graphids,
+        lambda metadata: {nodeid: node.alias for nodeid, node in metadata.nodes.items()},
+        lambda nodes: {str(nodeid): alias for nodeid, alias in nodes.values_list("nodeid", "alias")},
+    )
+
+
+def node_collections(graphids: list[str] | None = None) -> dict[str, str]:
+    """Collections of the concept nodes of the graphs, or of all graphs, by node ID."""
+
+    return _node_values(
+        graphids,
+        lambda metadata: metadata.collections,
+        lambda nodes: {
+            str(nodeid): str(config["rdmCollection"])
+            for nodeid, config in nodes.exclude(
+                config__rdmCollection__isnull=True
+            ).values_list("nodeid", "config")
+            if config.get("rdmCollection")
+        },
+    )
+
+
+def write_graph_cache(graphids: list[str], path: Path | None = None) -> Path:
+    """Write metadata for the given graphs from the database to the cache."""
+
+    path = path or get_graph_cache_path()
+    if not path:
+        raise RuntimeError("No graph cache path configured")
+
+    cache = {
+        "version": GRAPH_CACHE_VERSION,
+        "graphs": {
+            str(graphid): GraphMetadata.from_database(graphid)
+            for graphid in graphids
+        },
+    }
+    # Write and move, so workers never read a partial file.
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as cache_f:
+        pickle.dump(cache, cache_f)
+    os.replace(tmp_path, path)
+    _read_graph_cache.cache_clear()
+    return path
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+from arches.app.models.models import Node
+
+
+@dataclass(frozen=True)
+class GraphIndex:
+    """Precomputed structural lookups for a single graph.
+
+    Built once, alongside the node cache, so that hot paths do not need to
+    scan every node or edge to answer structural questions.
+    """
+
+    edges: Mapping[str, tuple[str, ...]]
+    nodes_by_alias: Mapping[str, Node]
+    parent_nodegroups: Mapping[str, str]
+    # Shared by every pseudo-node of a node, as child aliases mapped to the
+    # child node and whether it shares the node's tile.
+    child_nodes: Mapping[str, Mapping[str, tuple[Node, bool]]]
+
+    @classmethod
+    def build(cls, nodes: dict[str, Node], edge_pairs: list[tuple[str, str]]) -> "GraphIndex":
+        edges: dict[str, list[str]] = {}
+        domains: dict[str, list[str]] = {}
+        for domain, rang in edge_pairs:
+            edges.setdefault(domain, [])
+            edges[domain].append(rang)
+            domains.setdefault(rang, [])
+            domains[rang].append(domain)
+
+        # Children are kept in node order, so behaviour matches a scan of all nodes.
+        children: dict[str, list[Node]] = {}
+        for nodeid, node in nodes.items():
+            for domain in domains.get(nodeid, []):
+                children.setdefault(domain, [])
+                children[domain].append(node)
+
+        # A nodegroup is identified with its collector node, so its parent
+        # nodegroup is that of the first node with an edge to it (or, for
+        # the root, its node ID).
+        parent_nodegroups: dict[str, str] = {}
+        for domain, ranges in edges.items():
+            if (domain_node := nodes.get(domain)) is None:
+                continue
+            parent_nodegroup = (
+                str(domain_node.nodegroup_id)
+                if domain_node.nodegroup_id
+                else str(domain_node.nodeid)
+            )
+            for rang in ranges:
+                parent_nodegroups.setdefault(rang, parent_nodegroup)
+
+        no_child_nodes = MappingProxyType({})
+        child_nodes = {
+            nodeid: MappingProxyType({
+                child.alias: (child, not child.is_collector) for child in children[nodeid]
+            }) if nodeid in children else no_child_nodes
+            for nodeid in nodes
+        }
+
+        return cls(
+            edges=MappingProxyType({domain: tuple(ranges) for domain, ranges in edges.items()}),
+            nodes_by_alias=MappingProxyType({node.alias: node for node in nodes.values()}),
+            parent_nodegroups=MappingProxyType(parent_nodegroups),
+            child_nodes=MappingProxyType(child_nodes),
+        )
@@ -0,0 +1,143 @@
+"""A queue of resources waiting to be indexed.
+
+Saves add their resources here, and they are indexed together, in bulk, once
+the transaction saving them has committed, so that indexing always sees them.
+A resource queued several times is only indexed once.
+
+Unless indexing is deferred, each save is indexed as soon as it commits.
+Within a `deferred` block, resources wait, for that context alone, until the
+end of the outermost block. With the adapter's `defer_index` setting, they
+wait in a queue shared across the process, which is flushed explicitly or by
+a background thread, if a flush interval is set.
+"""
+
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from django.db import connections, transaction
+
+from .indexing import fetch_resources_with_tiles, index_resources
+
+logger = logging.getLogger(__name__)
+
+
+class IndexQueue:
+    def __init__(self, flush_interval: float | None = None):
+        self.flush_interval = flush_interval
+        # Committed resources, waiting for a flush from any context.
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Resources saved in the current context's deferred block.
+        self._scope = ContextVar("index_queue_scope", default=None)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._pending) + len(self._scope.get() or {})
+
+    @property
+    def deferring(self) -> bool:
+        return self._scope.get() is not None
+
+    def add(self, wrapper_cls, resourceids, flush: bool = True) -> None:
+        """Queue resources of a model for indexing, once the transaction saving them commits.
+
+        In a deferred block, they wait for the end of the block. Otherwise, they
+        are indexed as soon as they commit if `flush` is set, or wait in the
+        shared queue for the next flush.
+        """
+
+        resourceids = [str(resourceid) for resourceid in resourceids]
+        if (scope := self._scope.get()) is not None:
+            for resourceid in resourceids:
+                scope[resourceid] = wrapper_cls
+        elif flush:
+            transaction.on_commit(partial(self._index, dict.fromkeys(resourceids, wrapper_cls)))
+        else:
+            transaction.on_commit(partial(self._enqueue, wrapper_cls, resourceids))
+
+    def _enqueue(self, wrapper_cls, resourceids) -> None:
+        with self._lock:
+            for resourceid in resourceids:
+                self._pending[resourceid] = wrapper_cls
+        if self.flush_interval and self._thread is None:
+            self._start()
+
+    def flush(self) -> int:
+        """Index everything in the shared queue, returning how many resources were indexed."""
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            return self._index(pending)
+        except Exception:
+            # Anything queued since takes precedence.
+            with self._lock:
+                for resourceid, wrapper_cls in pending.items():
+                    self._pending.setdefault(resourceid, wrapper_cls)
+            raise
+
+    def _index(self, pending: dict) -> int:
+        if not pending:
+            return 0
+
+        resources = fetch_resources_with_tiles(list(pending))
+        found = {str(resource.resourceinstanceid) for resource in resources}
+        if (missing := [resourceid for resourceid in pending if resourceid not in found]):
+            # Most likely deleted since they were saved.
+            logger.warning("Could not find %d queued resources to index: %s", len(missing), ", ".join(missing))
+        count = index_resources(
+            [(resource, pending[str(resource.resourceinstanceid)]) for resource in resources],
+            fetch_tiles=False,
+        )
+        logger.info("Indexed %d queued resources", count)
+        return count
+
+    @contextmanager
+    def deferred(self):
+        """Queue resources saved in this block, and index them together once it ends and they commit."""
+
+        if self._scope.get() is not None:
+            yield self
+            return
+
+        scope = {}
+        token = self._scope.set(scope)
+        try:
+            yield self
+        finally:
+            self._scope.reset(token)
+            if scope:
+                transaction.on_commit(partial(self._index, scope))
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="arches-orm-index-queue", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush the index queue")
+            finally:
+                # This thread holds its own database connection.
+                connections.close_all()
+
+    def stop(self) -> None:
+        """Stop any background flushing, after a final flush."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            atexit.unregister(self.stop)
+        self._stop.clear()
+        self.flush()
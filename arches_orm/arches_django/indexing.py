@@ -0,0 +1,191 @@
+"""Building and sending search index documents for many resources at once.
+
+Documents are sent as they are built, in chunks bounded by both size and
+number of documents, with a limited number of bulk requests in flight, so
+memory stays flat however many resources are indexed. Building documents may
+also be spread across a pool of forked worker processes.
+"""
+
+import json
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connections
+from arches.app.models.resource import Resource
+from arches.app.models.system_settings import settings as system_settings
+from arches.app.models.tile import Tile as TileProxyModel
+from arches.app.search.mappings import TERMS_INDEX, RESOURCES_INDEX
+from arches.app.search.search_engine_factory import SearchEngineInstance, SearchEngineFactory
+from arches.app.utils import import_class_from_string
+
+logger = logging.getLogger(__name__)
+
+INDEX_CHUNK_BYTES = 10 * 1024 * 1024
+INDEX_CHUNK_DOCUMENTS = 500
+INDEX_MAX_IN_FLIGHT = 2
+INDEX_RESOURCES_PER_WORKER_CHUNK = 200
+
+
+class ChunkedBulkSender:
+    """Send bulk index items in bounded chunks, with bounded requests in flight."""
+
+    documents: int
+    chunks: int
+
+    def __init__(
+        self,
+        search_engine,
+        max_bytes: int = INDEX_CHUNK_BYTES,
+        max_documents: int = INDEX_CHUNK_DOCUMENTS,
+        max_in_flight: int = INDEX_MAX_IN_FLIGHT,
+    ):
+        self._se = search_engine
+        self.max_bytes = max_bytes
+        self.max_documents = max_documents
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._futures = []
+        self._chunk = []
+        self._chunk_bytes = 0
+        self.documents = 0
+        self.chunks = 0
+
+    def add(self, item: dict, size: int | None = None) -> None:
+        """Queue a bulk item, given its serialised size if it is known."""
+
+        if size is None:
+            size = len(json.dumps(item, default=str))
+        if self._chunk and (
+            self._chunk_bytes + size > self.max_bytes
+            or len(self._chunk) >= self.max_documents
+        ):
+            self._send()
+        self._chunk.append(item)
+        self._chunk_bytes += size
+        self.documents += 1
+
+    def _send(self) -> None:
+        chunk = self._chunk
+        self._chunk = []
+        self._chunk_bytes = 0
+        # Blocks until a request finishes, if too many are in flight.
+        self._in_flight.acquire()
+        future = self._executor.submit(self._se.bulk_index, chunk)
+        future.add_done_callback(lambda _: self._in_flight.release())
+        pending = []
+        for earlier in self._futures:
+            if earlier.done():
+                # Raises if the chunk failed to index.
+                earlier.result()
+            else:
+                pending.append(earlier)
+        self._futures = pending + [future]
+        self.chunks += 1
+
+    def close(self) -> None:
+        """Send any partial chunk and wait for every request, raising if any failed."""
+
+        try:
+            if self._chunk:
+                self._send()
+            for future in self._futures:
+                future.result()
+        finally:
+            self._executor.shutdown()
+
+    def abort(self) -> None:
+        """Drop any partial chunk and any requests not yet started."""
+
+        self._chunk = []
+        self._chunk_bytes = 0
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def fetch_resources_with_tiles(resourceids: list[str]) -> list[Resource]:
+    """Fetch resources, with all their tiles, in two queries."""
+
+    resources = {
+        resource.resourceinstanceid: resource
+        for resource in Resource.objects.filter(resourceinstanceid__in=resourceids)
+    }
+    for resource in resources.values():
+        resource.tiles = []
+    for tile in TileProxyModel.objects.filter(resourceinstance_id__in=list(resources)):
+        resources[tile.resourceinstance_id].tiles.append(tile)
+    return list(resources.values())
+
+
+def _index_documents(search_engine, resources_and_wrappers, fetch_tiles: bool) -> int:
+    count = 0
+    custom_indexes = [
+        import_class_from_string(index["module"])(index["name"])
+        for index in system_settings.ELASTICSEARCH_CUSTOM_INDEXES
+    ]
+    with ChunkedBulkSender(search_engine) as documents, ChunkedBulkSender(search_engine) as terms:
+        for resource, wkrm in resources_and_wrappers:
+            document, resource_terms = resource.get_documents_to_index(
+                fetchTiles=fetch_tiles,
+                datatype_factory=wkrm._datatype_factory(),
+                node_datatypes=wkrm._node_datatypes(),
+            )
+            # As for a resource indexed on its own.
+            document["root_ontology_class"] = resource.get_root_ontology()
+            for es_index in custom_indexes:
+                custom_document, custom_id = es_index.get_documents_to_index(resource, document["tiles"])
+                es_index.index_document(document=custom_document, id=custom_id)
+            documents.add(search_engine.create_bulk_item(
+                index=RESOURCES_INDEX, id=document["resourceinstanceid"], data=document
+            ), size=len(json.dumps(document, default=str)))
+            for term in resource_terms:
+                terms.add(search_engine.create_bulk_item(
+                    index=TERMS_INDEX, id=term["_id"], data=term["_source"]
+                ), size=len(json.dumps(term["_source"], default=str)))
+            count += 1
+    logger.info("Indexed %d resources in %d chunks", count, documents.chunks)
+    return count
+
+
+def _index_chunk(resourceids: list[str]) -> int:
+    from arches_orm.wkrm import get_well_known_resource_model_by_graph_id
+
+    # The parent's search engine client should not be shared across a fork.
+    search_engine = SearchEngineFactory().create()
+    resources = Resource.objects.filter(resourceinstanceid__in=resourceids)
+    return _index_documents(
+        search_engine,
+        (
+            (resource, get_well_known_resource_model_by_graph_id(resource.graph_id)._)
+            for resource in resources
+        ),
+        fetch_tiles=True,
+    )
+
+
+def index_resources(resources_and_wrappers, fetch_tiles: bool = False, processes: int | None = None) -> int:
+    """Index resources, each with the wrapper class of its model, returning how many were indexed.
+
+    If `processes` is more than one, the resources are refetched and their
+    documents built in that many forked worker processes.
+    """
+
+    if not processes or processes <= 1:
+        return _index_documents(SearchEngineInstance, resources_and_wrappers, fetch_tiles=fetch_tiles)
+
+    resourceids = [str(resource.resourceinstanceid) for resource, _ in resources_and_wrappers]
+    chunks = [
+        resourceids[n:n + INDEX_RESOURCES_PER_WORKER_CHUNK]
+        for n in range(0, len(resourceids), INDEX_RESOURCES_PER_WORKER_CHUNK)
+    ]
+    connections.close_all()
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        return sum(pool.imap_unordered(_index_chunk, chunks))
@@ -0,0 +1,66 @@
+"""Timings for the phases of a bulk load.
+
+Each phase of a load is timed as a span, with a count of the rows it handled,
+where that makes sense. Spans are collected in a `LoadReport`, which a caller
+may pass in to read afterwards, and each is also passed to a sink as it ends.
+The sink may be set with the adapter's `load_timing_sink` setting, as any
+callable taking the span and the report, for instance to record metrics. By
+default, spans are logged.
+"""
+
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    duration: float = 0.0
+    rows: int | None = None
+
+
+def log_span(span: Span, report: "LoadReport") -> None:
+    logger.info(
+        "Bulk load %s: %s took %.3fs%s",
+        report.loadid or "(not yet started)",
+        span.name,
+        span.duration,
+        "" if span.rows is None else f" ({span.rows} rows)",
+    )
+
+
+@dataclass
+class LoadReport:
+    loadid: str | None = None
+    spans: list[Span] = field(default_factory=list)
+    sink: Callable[[Span, "LoadReport"], None] | None = None
+
+    @contextmanager
+    def span(self, name: str, rows: int | None = None):
+        """Time a phase. The span is yielded, so that rows may be counted as it goes."""
+
+        span = Span(name, rows=rows)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - start
+            self.spans.append(span)
+            (self.sink or log_span)(span, self)
+
+    @property
+    def duration(self) -> float:
+        return sum(span.duration for span in self.spans)
+
+    def durations(self) -> dict[str, float]:
+        """Total time spent in each phase, by name."""
+
+        durations = {}
+        for span in self.spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        return durations
@@ -0,0 +1,29 @@
+from pathlib import Path
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Write the graph metadata cache for well-known resource models, for fast worker startup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            help="Cache file to write (defaults to the adapter's graph_cache_path or ARCHES_ORM_GRAPH_CACHE)",
+        )
+        parser.add_argument(
+            "--graph",
+            action="append",
+            dest="graphids",
+            help="Graph ID to include (may be repeated, defaults to all well-known resource models)",
+        )
+
+    def handle(self, *args, **options):
+        from arches_orm.wkrm import WELL_KNOWN_RESOURCE_MODELS
+        from arches_orm.arches_django.graph_cache import write_graph_cache
+
+        graphids = options["graphids"] or [wkrm.graphid for wkrm in WELL_KNOWN_RESOURCE_MODELS]
+        path = write_graph_cache(
+            graphids,
+            path=Path(options["path"]) if options["path"] else None
+        )
+        self.stdout.write(f"Wrote metadata for {len(graphids)} graph(s) to {path}")
@@ -0,0 +1,105 @@
+"""A cache of permission checks, shared by every request in the process.
+
+Checks, such as whether a user may read a graph, are cached against the
+permission, user ID and graph ID, for a limited time and up to a limited
+number of entries, set by the adapter's `permission_cache_ttl` and
+`permission_cache_size` settings. Caching is off unless a TTL is set.
+
+When users, groups or object permissions change, the entries they could
+affect are dropped straight away, but only in the process that made the
+change. Other processes may go on using the old permissions for up to the
+TTL, so it should be kept short where permissions change while serving.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from guardian.models import GroupObjectPermission, UserObjectPermission
+
+PERMISSION_CACHE_TTL = 0.0
+PERMISSION_CACHE_SIZE = 10000
+
+
+class PermissionCache:
+    def __init__(self, ttl: float | None = PERMISSION_CACHE_TTL, max_size: int = PERMISSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_set(self, permission: str, user_id: Hashable, graph_id: str, check: Callable[[], Any]) -> Any:
+        """Return the cached result of a check, running it if it is missing or expired."""
+
+        if not self.ttl or not self.max_size:
+            return check()
+
+        key = (permission, user_id, str(graph_id))
+        now = time.monotonic()
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        value = check()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, user_id: Hashable | None = None) -> None:
+        """Drop entries for a user or, if none is given, every entry."""
+
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[1] == user_id]:
+                    del self._entries[key]
+
+
+def _invalidate(user_id=None):
+    from arches_orm.adapter import get_adapter
+
+    get_adapter("arches-django").invalidate_permissions(user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_permissions(sender, instance, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver(post_save, sender=UserObjectPermission)
+@receiver(post_delete, sender=UserObjectPermission)
+def invalidate_user_object_permissions(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=GroupObjectPermission)
+@receiver(post_delete, sender=GroupObjectPermission)
+@receiver(post_delete, sender=Group)
+def invalidate_group_permissions(sender, **kwargs):
+    _invalidate()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_memberships(sender, instance, action, reverse, **kwargs):
+    if action.startswith("post_"):
+        # From the group or permission side, any of its users may be affected.
+        _invalidate(None if reverse else instance.pk)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_memberships(sender, action, **kwargs):
+    if action.startswith("post_"):
+        _invalidate()
@@ -0,0 +1,42 @@
+"""A user's read and write permissions on the nodegroups of one graph.
+
+The view is built once for each user and graph, and passed through loading
+and saving, so that each check is a set lookup. Nodegroups are held as UUIDs,
+as they are on nodes and tiles, and only string IDs are converted.
+"""
+
+import uuid
+from dataclasses import dataclass
+from typing import Iterable
+
+
+def _as_uuid(nodegroup_id) -> uuid.UUID:
+    return nodegroup_id if isinstance(nodegroup_id, uuid.UUID) else uuid.UUID(str(nodegroup_id))
+
+
+@dataclass(frozen=True)
+class PermissionView:
+    graphid: str
+    readable: frozenset[uuid.UUID]
+    writable: frozenset[uuid.UUID]
+
+    @classmethod
+    def build(cls, graphid, nodegroupids: Iterable, readable: Iterable, writable: Iterable) -> "PermissionView":
+        """Make a view of the graph's nodegroups, from those the user may read and write across all graphs."""
+
+        nodegroupids = {_as_uuid(nodegroupid) for nodegroupid in nodegroupids}
+        return cls(
+            graphid=str(graphid),
+            readable=frozenset(nodegroupids.intersection(_as_uuid(nodegroupid) for nodegroupid in readable)),
+            writable=frozenset(nodegroupids.intersection(_as_uuid(nodegroupid) for nodegroupid in writable)),
+        )
+
+    @classmethod
+    def denied(cls, graphid) -> "PermissionView":
+        return cls(graphid=str(graphid), readable=frozenset(), writable=frozenset())
+
+    def can_read(self, nodegroup_id) -> bool:
+        return nodegroup_id is not None and _as_uuid(nodegroup_id) in self.readable
+
+    def can_write(self, nodegroup_id) -> bool:
+        return nodegroup_id is not None and _as_uuid(nodegroup_id) in self.writable
@@ -1,12 +1,23 @@
 from arches.app.models.tile import Tile as TileProxyModel
-from collections import UserList
 
 from arches_orm.view_models import ViewModel, NodeListViewModel, UnavailableViewModel, ResourceInstanceViewModel
 
 from .datatypes import get_view_model_for_datatype
 
 
-class PseudoNodeList(UserList):
+# Resources hold a pseudo-node for every loaded node, so these are slotted
+# to avoid carrying a __dict__ each.
+class PseudoNodeList(list):
+    __slots__ = (
+        "node",
+        "_parent",
+        "_parent_cls",
+        "tile",
+        "_parent_node",
+        "parenttile_id",
+        "_ghost_children",
+    )
+
     def __init__(self, node, parent=None, parent_cls=None):
         super().__init__()
         self.node = node
@@ -130,11 +141,22 @@ class PseudoNodeList(UserList):
 
 
 class PseudoNodeValue:
-    _value_loaded = False
-    _value = None
-    _datatype = None
-    _multiple = False
-    _as_tile_data = None
+    __slots__ = (
+        "node",
+        "tile",
+        "relationships",
+        "_parent",
+        "_parent_cls",
+        "_parent_node",
+        "_child_nodes",
+        "_value",
+        "_value_loaded",
+        "_datatype",
+        "_multiple",
+        "_as_tile_data",
+        "_accessed",
+        "_original_tile",
+    )
 
     def __init__(self, node, tile=None, value=None, parent=None, child_nodes=None, parent_cls=None):
         self.node = node
@@ -150,6 +172,10 @@ class PseudoNodeValue:
         self._parent_node = None
         self._child_nodes = child_nodes
         self._value = value
+        self._value_loaded = False
+        self._datatype = None
+        self._multiple = False
+        self._as_tile_data = None
         self._accessed = False
         self._original_tile = tile
 
@@ -279,6 +305,8 @@ class PseudoNodeValue:
         return bool(self.value)
 
 class PseudoNodeUnavailable:
+    __slots__ = ("node", "_parent", "_parent_cls", "_parent_node", "_child_nodes")
+
     def __init__(self, node, parent=None, child_nodes=None, parent_cls=None):
         self.node = node
         if parent_cls is None:
@@ -0,0 +1,124 @@
+"""Checking read and delete permissions on many resources at once.
+
+Arches checks a user's access to a resource instance one resource at a time,
+with several queries each. Here, the same rules are applied to a set of
+resources of one graph, reading the instance permissions for all of them
+in one query for the user and one for their groups.
+"""
+
+from typing import Callable
+from django.contrib.contenttypes.models import ContentType
+from guardian.models import GroupObjectPermission, UserObjectPermission
+from arches.app.models.models import Node, ResourceInstance, TileModel
+from arches.app.models.system_settings import settings as system_settings
+from arches.app.utils.permission_backend import get_nodegroups_by_perm
+
+READ_PERMISSION = "view_resourceinstance"
+DELETE_PERMISSION = "delete_resourceinstance"
+NO_ACCESS_PERMISSION = "no_access_to_resourceinstance"
+
+
+def _instance_permissions(model, resourceids: list[str], **filters) -> dict[str, set[str]]:
+    permissions: dict[str, set[str]] = {}
+    rows = model.objects.filter(
+        content_type=ContentType.objects.get_for_model(ResourceInstance),
+        object_pk__in=resourceids,
+        **filters,
+    ).values_list("object_pk", "permission__codename")
+    for object_pk, codename in rows:
+        permissions.setdefault(str(object_pk), set()).add(codename)
+    return permissions
+
+
+def _permitted_resource_ids(
+    user, resourceids: list[str], permission: str, implied: Callable[[list[str]], set[str]]
+) -> set[str]:
+    """Return those of the resources for which the user has the permission.
+
+    As with `check_resource_instance_permissions`, a user's own instance
+    permissions take precedence over those of their groups. Resources with no
+    instance permissions at all are passed, together, to `implied`, which
+    returns those of them that are permitted.
+    """
+
+    resourceids = [str(resourceid) for resourceid in resourceids]
+    if not user.is_authenticated:
+        return set()
+    if user.is_superuser:
+        return set(resourceids)
+
+    user_permissions = _instance_permissions(UserObjectPermission, resourceids, user=user)
+    group_permissions = _instance_permissions(
+        GroupObjectPermission, resourceids, group__in=user.groups.all()
+    )
+
+    permitted = set()
+    unknown = []
+    for resourceid in resourceids:
+        if resourceid == str(system_settings.SYSTEM_SETTINGS_RESOURCE_ID):
+            if not user.groups.filter(name="System Administrator").exists():
+                continue
+        own = user_permissions.get(resourceid, set())
+        group = group_permissions.get(resourceid, set())
+        if not own and not group:
+            unknown.append(resourceid)
+        elif NO_ACCESS_PERMISSION in own:
+            continue
+        elif permission in own:
+            permitted.add(resourceid)
+        elif NO_ACCESS_PERMISSION not in group and permission in group:
+            permitted.add(resourceid)
+    if unknown:
+        permitted |= implied(unknown)
+    return permitted
+
+
+def readable_resource_ids(user, resourceids: list[str], can_read_graph: bool) -> set[str]:
+    """Return those of the resources, all of one graph, that the user may read.
+
+    As with `user_can_read_resource`, a resource with no instance permissions
+    is readable if the graph is. `can_read_graph` is whether the user may read
+    the graph the resources belong to.
+    """
+
+    return _permitted_resource_ids(
+        user,
+        resourceids,
+        READ_PERMISSION,
+        lambda unknown: set(unknown) if can_read_graph else set(),
+    )
+
+
+def deletable_resource_ids(user, resourceids: list[str], graphid: str) -> set[str]:
+    """Return those of the resources, all of the graph, that the user may delete.
+
+    As with `user_can_delete_resource`, a resource with no instance permissions
+    may be deleted if none of its tiles are in nodegroups the user may not
+    delete, and the user is a resource editor or may delete some nodegroup of
+    the graph. Resources that do not exist are treated as deletable.
+    """
+
+    def _implied(unknown: list[str]) -> set[str]:
+        nodegroups = get_nodegroups_by_perm(user, "models.delete_nodegroup")
+        can_delete_graph = (
+            user.groups.filter(name__in=system_settings.RESOURCE_EDITOR_GROUPS).exists()
+            or Node.objects.filter(nodegroup__in=nodegroups, graph_id=graphid).exists()
+        )
+        if not can_delete_graph:
+            return set()
+        protected = TileModel.objects.filter(resourceinstance_id__in=unknown).exclude(
+            nodegroup_id__in=[nodegroup.nodegroupid for nodegroup in nodegroups]
+        ).values_list("resourceinstance_id", flat=True)
+        return set(unknown) - {str(resourceid) for resourceid in protected}
+
+    if not user.is_authenticated:
+        return set()
+    resourceids = [str(resourceid) for resourceid in resourceids]
+    existing = {
+        str(resourceid)
+        for resourceid in ResourceInstance.objects.filter(
+            resourceinstanceid__in=resourceids
+        ).values_list("resourceinstanceid", flat=True)
+    }
+    missing = {resourceid for resourceid in resourceids if resourceid not in existing}
+    return missing | _permitted_resource_ids(user, sorted(existing), DELETE_PERMISSION, _implied)
@@ -0,0 +1,161 @@
+"""Writing tile rows into the `load_staging` table for bulk loads.
+
+On PostgreSQL, rows are streamed in with `COPY ... FROM STDIN`, in chunks to
+keep memory bounded. Elsewhere, or if COPY is not available from the driver,
+they are inserted with batched `executemany` calls.
+"""
+
+import io
+import time
+import logging
+from typing import Any, Iterable, NamedTuple
+from arches.app.utils.betterJSONSerializer import JSONSerializer
+
+logger = logging.getLogger(__name__)
+
+STAGING_CHUNK_SIZE = 5000
+STAGING_COLUMNS = (
+    "nodegroupid",
+    "legacyid",
+    "resourceid",
+    "tileid",
+    "parenttileid",
+    "value",
+    "loadid",
+    "nodegroup_depth",
+    "source_description",
+    "operation",
+    "passes_validation",
+)
+
+
+class StagingRow(NamedTuple):
+    nodegroupid: Any
+    legacyid: Any
+    resourceid: Any
+    tileid: Any
+    value: dict
+    nodegroup_depth: int
+    source_description: str
+    operation: str = "insert"
+    passes_validation: bool = True
+    parenttileid: Any = None
+
+
+def _copy_text(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def tile_depths(parents: dict) -> dict:
+    """Depth of each tile, given each tile's parent tile ID, so parents are staged first."""
+
+    depths = {}
+
+    def _depth(tileid):
+        if tileid not in depths:
+            parent = parents.get(tileid)
+            depths[tileid] = 0 if parent is None or parent not in parents else _depth(parent) + 1
+        return depths[tileid]
+
+    for tileid in parents:
+        _depth(tileid)
+    return depths
+
+
+class StagingWriter:
+    """Write staging rows for a single load, recording throughput."""
+
+    rows: int
+    elapsed: float
+
+    def __init__(self, cursor, loadid: str, chunk_size: int = STAGING_CHUNK_SIZE):
+        self._cursor = cursor
+        self._serializer = JSONSerializer()
+        self.loadid = loadid
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def _copy_expert(self):
+        # Django wraps the driver cursor, which only has COPY support for psycopg2.
+        if self._cursor.db.vendor != "postgresql":
+            return None
+        return getattr(getattr(self._cursor, "cursor", None), "copy_expert", None)
+
+    def _values(self, row: StagingRow) -> tuple:
+        return (
+            row.nodegroupid,
+            row.legacyid,
+            row.resourceid,
+            row.tileid,
+            row.parenttileid,
+            self._serializer.serialize(row.value),
+            self.loadid,
+            row.nodegroup_depth,
+            row.source_description,
+            row.operation,
+            row.passes_validation,
+        )
+
+    def _chunks(self, rows: Iterable[StagingRow]):
+        chunk = []
+        for row in rows:
+            chunk.append(self._values(row))
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _copy(self, copy_expert, chunk: list[tuple]) -> None:
+        buffer = io.StringIO()
+        for values in chunk:
+            buffer.write("\t".join(_copy_text(value) for value in values))
+            buffer.write("\n")
+        buffer.seek(0)
+        copy_expert(f"COPY load_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN", buffer)
+
+    def _executemany(self, chunk: list[tuple]) -> None:
+        self._cursor.executemany(
+            f"""INSERT INTO load_staging ({', '.join(STAGING_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(STAGING_COLUMNS))})""",
+            chunk,
+        )
+
+    def write(self, rows: Iterable[StagingRow]) -> int:
+        """Stage rows, returning how many were written."""
+
+        start = time.perf_counter()
+        copy_expert = self._copy_expert()
+        written = 0
+        for chunk in self._chunks(rows):
+            if copy_expert:
+                self._copy(copy_expert, chunk)
+            else:
+                self._executemany(chunk)
+            written += len(chunk)
+        self.rows += written
+        self.elapsed += time.perf_counter() - start
+        logger.info(
+            "Staged %d rows for load %s in %.2fs (%.0f rows/s, %s)",
+            self.rows,
+            self.loadid,
+            self.elapsed,
+            self.rows_per_second,
+            "COPY" if copy_expert else "executemany",
+        )
+        return written
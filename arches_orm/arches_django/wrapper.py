@@ -1,8 +1,12 @@
-from typing import Any
+from typing import Any, Iterable, Iterator
+import itertools
 import json
+import uuid
 from arches.app.models.resource import Resource
 from django.dispatch import Signal
 from collections import UserDict
+from copy import deepcopy
+from contextlib import nullcontext
 from functools import lru_cache
 from datetime import datetime
 from django.db import transaction
@@ -26,8 +30,16 @@ from arches_orm.errors import WKRIPermissionDenied, WKRMPermissionDenied, Descri
 from arches_orm.view_models.resources import RelatedResourceInstanceViewModelMixin
 
 
-from .bulk_create import BulkImportWKRM
+from .bulk_create import BulkImportWKRM, CHECKPOINT_DESCRIPTION, completed_batches
+from .bulk_delete import delete_resources, deindex_resources
+from .bulk_records import build_records_in_pool
+from .resource_permissions import deletable_resource_ids, readable_resource_ids
+from .permission_view import PermissionView
 from .pseudo_nodes import PseudoNodeList, PseudoNodeValue, PseudoNodeUnavailable
+from .graph_index import GraphIndex
+from .graph_cache import load_graph_metadata
+from .crosses import PendingSave, reconcile_crosses
+from .load_report import LoadReport
 from .filters import SearchMixin
 
 logger = logging.getLogger(__name__)
@@ -35,19 +47,31 @@ logger = logging.getLogger(__name__)
 
 LOAD_FULL_NODE_OBJECTS = True
 LOAD_ALL_NODES = True
+# Number of resources whose tiles are retrieved in a single query when
+# hydrating many resources at once (e.g. `all`, `find_many`).
+HYDRATION_BATCH_SIZE = 500
 
 
 def get_permitted_nodegroups(user):
-    # To separate read and write, we need to know which tile nodes
-    # have changed when saving (reliably).
+    # Tiles are only written if they have changed, so a user may load
+    # nodegroups they can read but not write, and save the rest.
     nodegroups = [str(ng) for ng in get_nodegroups_by_perm(user, "models.write_nodegroup")]
     return nodegroups
 
+def get_readable_nodegroups(user):
+    nodegroups = [str(ng) for ng in get_nodegroups_by_perm(user, "models.read_nodegroup")]
+    return nodegroups
+
+def _tile_key(tile):
+    # As tiles compare equal by primary key, where they have one.
+    return ("pk", str(tile.pk)) if tile.pk is not None else ("id", id(tile))
+
 class ValueList(UserDict):
     def __init__(self, values, wrapper, related_prefetch):
         self._wrapper = wrapper
         self._related_prefetch = related_prefetch
         self._values = values
+        self._child_index = None
 
     @property
     def data(self):
@@ -58,10 +82,77 @@ class ValueList(UserDict):
     def setdefault(self, key, value):
         # Gives us a chance to lazy-load
         self._get(key, value, raise_error=False)
+        if key not in self._values:
+            self._child_index = None
         self._values.setdefault(key, value)
 
     def __setitem__(self, key, value):
         self._values[key] = value
+        self._child_index = None
+
+    def add(self, key, value):
+        """Add a pseudo-node for an alias, keeping the child index up to date."""
+        self.setdefault(key, [])
+        values = self._values[key]
+        values.append(value)
+        if self._child_index is not None:
+            self._index_child(key, len(values) - 1, value)
+
+    def invalidate_child_index(self):
+        self._child_index = None
+
+    def _index_child(self, key, position, value):
+        index, key_order = self._child_index
+        key_order.setdefault(key, len(key_order))
+        if isinstance(value, PseudoNodeList) or getattr(value, "tile", None) is None:
+            # A list's parent tile is only known once it has items, and a
+            # tile may be made for a node later, so always consider these.
+            buckets = [(key,)]
+        else:
+            parenttile_id = value.tile.parenttile_id
+            buckets = [
+                (key, "parent", str(parenttile_id) if parenttile_id else None),
+                (key, "tile", _tile_key(value.tile)),
+            ]
+        for bucket in buckets:
+            index.setdefault(bucket, [])
+            index[bucket].append((position, value))
+
+    def child_candidates(self, child_nodes, tile):
+        """Pseudo-nodes that may be children of a semantic node, as (alias, pseudo-node) pairs.
+
+        Children that share the semantic node's tile are looked up by that tile
+        and by parent tile, rather than by scanning every loaded pseudo-node.
+        Pairs come in the order of the loaded values.
+        """
+
+        if self._child_index is None:
+            self._child_index = ({}, {key: order for order, key in enumerate(self._values)})
+            for key, values in self._values.items():
+                for position, value in enumerate(values or []):
+                    self._index_child(key, position, value)
+        index, key_order = self._child_index
+
+        candidates = []
+        for key, (_, shares_tile) in child_nodes.items():
+            if not (values := self._values.get(key)):
+                continue
+            if not shares_tile:
+                found = list(enumerate(values))
+            else:
+                found = index.get((key,), [])
+                if tile:
+                    found = found + index.get((key, "tile", _tile_key(tile)), []) + index.get(
+                        (key, "parent", str(tile.tileid) if tile.tileid else None), []
+                    )
+                found = sorted({id(value): (position, value) for position, value in found}.values(), key=lambda entry: entry[0])
+            candidates.append((key_order[key], key, found))
+
+        return [
+            (key, value)
+            for _, key, found in sorted(candidates, key=lambda candidate: candidate[0])
+            for _, value in found
+        ]
 
     def __getitem__(self, key):
         result = self._values[key]
@@ -86,6 +177,7 @@ class ValueList(UserDict):
                 self._values.update(ng)
             else:
                 del self._values[key]
+            self._child_index = None
         if raise_error:
             return self.data[key]
         else:
@@ -94,6 +186,8 @@ class ValueList(UserDict):
 class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
     _nodes_real: dict = None
     _nodegroup_objects_real: dict = None
+    _graph_index_real: GraphIndex | None = None
+    _prefetched: dict | None = None
     _values_list: ValueList | None = None
     _values_real: list | None = None
     __datatype_factory = None
@@ -180,7 +274,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             )
 
     def _update_tiles(
-        self, tiles, all_values=None, nodegroup_id=None, root=None, parent=None, permitted_nodegroups: None | list[str]=None
+        self, tiles, all_values=None, nodegroup_id=None, root=None, parent=None, permissions: None | PermissionView=None
     ):
         if not root:
             if not all_values:
@@ -207,7 +301,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             if isinstance(pseudo_node, PseudoNodeList) or pseudo_node.accessed:
                 if len(pseudo_node):
                     subrelationships, subghost_tiles = self._update_tiles(
-                        tiles, root=pseudo_node, parent=parent, permitted_nodegroups=permitted_nodegroups
+                        tiles, root=pseudo_node, parent=parent, permissions=permissions
                     )
                     relationships += subrelationships
                     ghost_tiles |= subghost_tiles
@@ -219,7 +313,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                     }
                 else:
                     t, r = pseudo_node.get_tile()
-                    if t is not None and permitted_nodegroups is not None and (t.nodegroup_id is None or str(t.nodegroup_id) not in permitted_nodegroups):
+                    if t is not None and permissions is not None and not permissions.can_write(t.nodegroup_id):
                         # Warn if we can
                         if pseudo_node._original_tile and hasattr(pseudo_node._original_tile, "_original_data"):
                             if t.data == pseudo_node._original_tile._original_data:
@@ -256,20 +350,93 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         _known_new=False,
         _do_index=True,
         save_related_if_missing=True,
+        full_save=False,
+        refetch=False,
     ):
         """Construct an Arches resource.
 
-        This may be new or existing, for this well-known resource.
+        This may be new or existing, for this well-known resource. When saving
+        an existing resource, only added, changed or removed tiles are written,
+        unless `full_save` is set, in which case the whole resource is resaved.
+        Resource and relationship IDs are assigned before saving, so that it
+        happens once; set `refetch` to reload the resource afterwards.
         """
         if not _no_save and not self._can_edit_resource():
             raise WKRIPermissionDenied()
 
-        resource = Resource(resourceinstanceid=self.id, graph_id=self.graphid)
+        pending = self._prepare_save(full_save=full_save, _no_save=_no_save)
+
+        # Anything the resource relates to is saved in the same transaction, so
+        # that it may refer back to this resource before it is written.
+        try:
+            with (nullcontext() if _no_save else transaction.atomic()):
+                changes = reconcile_crosses(
+                    [pending],
+                    save_crosses=self._adapter.config.get("save_crosses", False),
+                    save_related_if_missing=save_related_if_missing,
+                )
+                if not _no_save:
+                    self._write_resource(pending, refetch=refetch)
+                    changes.apply()
+        except Exception:
+            if pending.is_new and not _no_save:
+                self.id = None
+            raise
+
+        if _do_index and not _no_save:
+            self._adapter.index(type(self), [self.id])
+
+        return self.resource
+
+    @classmethod
+    def save_many(cls, wkris, full_save=False, save_related_if_missing=True, _do_index=True):
+        """Save several well-known resources together.
+
+        Their relationships are reconciled in one go, so that existing crosses
+        are fetched with one query, and added or removed in bulk.
+        """
+        wkris = [wkri._ if hasattr(wkri, "_") else wkri for wkri in wkris]
+        for wkri in wkris:
+            if not wkri._can_edit_resource():
+                raise WKRIPermissionDenied()
+
+        pending_saves = [wkri._prepare_save(full_save=full_save) for wkri in wkris]
+        try:
+            with transaction.atomic():
+                changes = reconcile_crosses(
+                    pending_saves,
+                    save_crosses=cls._adapter.config.get("save_crosses", False),
+                    save_related_if_missing=save_related_if_missing,
+                )
+                for pending in pending_saves:
+                    pending.wkri._write_resource(pending)
+                changes.apply()
+        except Exception:
+            for pending in pending_saves:
+                if pending.is_new:
+                    pending.wkri.id = None
+            raise
+
+        if _do_index:
+            cls._adapter.index(cls, [wkri.id for wkri in wkris])
+
+        return [wkri.view_model_inst for wkri in wkris]
+
+    def _prepare_save(self, full_save=False, _no_save=False):
+        """Build the Arches resource and tiles for this well-known resource, ready to write."""
+
+        is_new = not self.id
+        resource = Resource(resourceinstanceid=self.id or self._new_id, graph_id=self.graphid)
+        if not resource.resourceinstanceid:
+            resource.resourceinstanceid = uuid.uuid4()
         tiles = {}
-        permitted_nodegroups = self._permitted_nodegroups()
-        relationships, ghost_tiles = self._update_tiles(tiles, self._values, permitted_nodegroups=permitted_nodegroups)
-        for tile in ghost_tiles:
-            tile.delete()
+        relationships, ghost_tiles = self._update_tiles(tiles, self._values, permissions=self._permission_view())
+        # Parent tiles may have been set, so tiles are no longer indexed under them.
+        self._values.invalidate_child_index()
+        save_changed_only = not full_save and not _no_save and not is_new
+        if not save_changed_only:
+            for tile in ghost_tiles:
+                tile.delete()
 
         # parented tiles are saved hierarchically
         resource.tiles = [t for t in sum((ts for ts in tiles.values()), [])]
@@ -284,108 +451,115 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         # This is required to avoid e.g. missing related models preventing
         # saving (as we cannot import those via CSV on first step)
         self._pending_relationships = []
-        do_final_save = False
         if not _no_save:
-            if (
-                self.id
-                and resource.resourceinstanceid
-                and self.id == resource.resourceinstanceid
-            ):
-                do_final_save = True
-            else:
-                bypass = system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION
-                system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = True
-                # all_tiles = resource.tiles
-                # parentless_tiles = [tile for tile in all_tiles if not tile.parenttile]
-                ## This only solves the problem for _one_ level of nesting
-                # if len(all_tiles) > len(parentless_tiles):
-                #    resource.tiles = parentless_tiles
-                #    resource.save()
-                #    resource.tiles = all_tiles
-
-                # This fills out the tiles with None values
-                with transaction.atomic():
-                    resource.save()
-                self.id = resource.resourceinstanceid
-                system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = bypass
+            self.id = resource.resourceinstanceid
         elif not resource._state.adding:
             self.id = resource.resourceinstanceid
 
         self.resource = resource
 
-        # Don't think we actually need this if the resource gets saved, as postsave RI
-        # datatype handles it. We do for sqlite at the very least, and likely gathering
-        # for bulk.
-        _no_save = _no_save or not (self._adapter.config.get("save_crosses", False))
-        # TODO: fix expectation of one cross per tile
+        # Anything loaded earlier in this context is now stale.
+        if not _no_save and (identity_map := self._adapter.get_identity_map()) is not None:
+            identity_map.discard(self.id)
 
-        crosses = {}
-        for cross in ResourceXResource.objects.filter(
-            resourceinstanceidfrom=resource
-        ):
-            crosses.setdefault(str(cross.tileid), [])
-            crosses[str(cross.tileid)].append(cross)
-        for tile_ix, nodegroup_id, nodeid, related in relationships:
-            value = tiles[nodegroup_id][tile_ix].data[nodeid]
-            tileid = str(tiles[nodegroup_id][tile_ix].tileid)
-            if not related.id:
-                if save_related_if_missing:
-                    related.save()
-                else:
-                    logger.warning("Not saving a related model as not requested")
-                    continue
-            need_cross = tileid not in crosses
-            cross_resourcexid = None
-            if tileid in crosses:
-                for cross in crosses[tileid]:
-                    if (
-                        str(cross.resourceinstanceidto_id) == str(related.id) and
-                        str(cross.resourceinstanceidfrom_id) == str(resource.id)
-                    ):
-                        need_cross = False
-                        cross_resourcexid = str(cross.resourcexid)
-            if need_cross:
-                cross = ResourceXResource(
-                    resourceinstanceidfrom=resource,
-                    resourceinstanceidto_id=related.id,
-                )
-                if _no_save:
-                    self._pending_relationships.append((value, related, self))
-                else:
-                    cross.save()
-                    cross_resourcexid = str(cross.resourcexid)
-
-            cross_value = {
-                "resourceId": str(cross.resourceinstanceidto_id),
-                "ontologyProperty": "",
-                "resourceXresourceId": cross_resourcexid,
-                "inverseOntologyProperty": "",
-            }
-            if isinstance(value, list):
-                if not any(
-                    (entry["resourceId"] == cross_value["resourceId"]) or
-                    (
-                        entry["resourceXresourceId"] is not None and
-                        entry["resourceXresourceId"] == cross_value["resourceXresourceId"]
-                    )
-                    for entry in value
-                ):
-                    value.append(cross_value)
-            else:
-                value.update(cross_value)
-            do_final_save = True
+        return PendingSave(
+            wkri=self,
+            resource=resource,
+            tiles=tiles,
+            relationships=relationships,
+            ghost_tiles=ghost_tiles,
+            is_new=is_new,
+            save_changed_only=save_changed_only,
+            no_save=_no_save,
+        )
 
-        if do_final_save:
-            with transaction.atomic():
-                resource.save()
+    def _write_resource(self, pending, refetch=False):
+        """Write a prepared resource, once its relationships have been filled in."""
+
+        resource = pending.resource
+        if pending.save_changed_only:
+            resource = self._save_changed_tiles(resource, pending.ghost_tiles)
+        else:
+            bypass = system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION
+            if pending.is_new:
+                system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = True
+            try:
+                # Indexing is left to the adapter, once everything is written.
+                resource.save(index=False)
+            finally:
+                system_settings.BYPASS_REQUIRED_VALUE_TILE_VALIDATION = bypass
+            for tile in resource.tiles:
+                tile._original_data = deepcopy(tile.data)
+        if refetch:
             resource = Resource.objects.get(resourceinstanceid=self.id)
-            self.resource = resource
+        else:
+            self._load_descriptors(resource)
+        self.resource = resource
 
-        if _do_index:
-            self.resource.index()
+    @staticmethod
+    def _tile_has_changed(tile):
+        if tile._state.adding or not tile.tileid:
+            return True
+        # Recorded by the Tile post_init hook, so may not be present.
+        if not hasattr(tile, "_original_data"):
+            return True
+        # A parent that is not loaded was read from the database, so is not new.
+        parent = ArchesDjangoResourceWrapper._loaded_parent(tile)
+        if parent is not None and parent._state.adding:
+            return True
+        return (tile.data or {}) != (tile._original_data or {})
+
+    @staticmethod
+    def _loaded_parent(tile):
+        """The parent of a tile, if it is already loaded, without fetching it."""
+        if tile.parenttile_id and type(tile).parenttile.is_cached(tile):
+            return tile.parenttile
+        return None
+
+    def _save_changed_tiles(self, resource, ghost_tiles):
+        """Write only the tiles that were added, changed or removed.
+
+        Descriptors are kept up to date by Arches as each tile is saved.
+        """
+
+        changed = [
+            tile for tile in resource.tiles
+            if self._tile_has_changed(tile)
+        ]
+        with transaction.atomic():
+            for tile in ghost_tiles:
+                tile.delete()
+
+            # Parents must exist before their children.
+            saved = set()
+            while changed:
+                pending = {id(tile) for tile in changed}
+                ready = [
+                    tile for tile in changed
+                    if (parent := self._loaded_parent(tile)) is None or id(parent) not in pending
+                ]
+                if not ready:
+                    raise RuntimeError(f"Could not order tiles for saving in {self}")
+                for tile in ready:
+                    tile.resourceinstance_id = resource.resourceinstanceid
+                    tile.save(index=False)
+                    tile._original_data = deepcopy(tile.data)
+                    saved.add(id(tile))
+                changed = [tile for tile in changed if id(tile) not in saved]
 
         return resource
 
+    @staticmethod
+    def _load_descriptors(resource):
+        """Read back descriptors that Arches stored while saving, without refetching everything."""
+        # Older versions of Arches calculate descriptors on demand instead.
+        if not hasattr(resource, "save_descriptors"):
+            return
+        stored = Resource.objects.filter(pk=resource.resourceinstanceid).values("descriptors", "name").first()
+        if stored:
+            resource.descriptors = stored["descriptors"]
+            resource.name = stored["name"]
+
     @classmethod
     def _datatype_factory(cls):
         """Caching datatype factory retrieval (possibly unnecessary)."""
@@ -402,10 +576,18 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
 
     @classmethod
     def _node_objects_by_alias(cls):
-        if hasattr(cls.__bases__[0], "_node_objects_by_alias") and cls.proxy:
-            return cls.__bases__[0]._node_objects_by_alias()
+        return cls._graph_index().nodes_by_alias
 
-        return {node.alias: node for node in cls._node_objects().values()}
+    @classmethod
+    def _graph_index(cls) -> GraphIndex:
+        """Structural lookups for this model's graph, built with the nodes."""
+
+        if hasattr(cls.__bases__[0], "_graph_index") and cls.proxy:
+            return cls.__bases__[0]._graph_index()
+
+        if cls._graph_index_real is None:
+            cls._build_nodes()
+        return cls._graph_index_real
 
     @classmethod
     def _context_req(cls, key):
@@ -444,7 +626,12 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
 
         # If set to False, rather than unset, then no.
         if (user_graph := user_graphs.get(str(cls))) is None:
-            user_graph = bool(user_can_read_graph(user, str(cls.graphid)))
+            user_graph = cls._adapter.get_permission_cache().get_or_set(
+                "read_graph",
+                getattr(user, "pk", None),
+                cls.graphid,
+                lambda: bool(user_can_read_graph(user, str(cls.graphid))),
+            )
             user_graphs[str(cls)] = (
                 {}
                 if user_graph else
@@ -457,9 +644,26 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         return user_graph
 
     @classmethod
-    def _permitted_nodegroups(cls):
+    def _readable_resources(cls, resources):
+        """Filter resources of this model to those the user may read, in one pass."""
+
+        if not (user := cls._context_get("user")) or not resources:
+            # Context-free
+            return list(resources)
+
+        readable = readable_resource_ids(
+            user,
+            list({str(resource.resourceinstanceid) for resource in resources}),
+            cls._can_read_graph(),
+        )
+        return [resource for resource in resources if str(resource.resourceinstanceid) in readable]
+
+    @classmethod
+    def _permission_view(cls):
+        """The user's read and write permissions on the nodegroups of this model."""
+
         if not cls ._can_read_graph():
-            return []
+            return PermissionView.denied(cls.graphid)
 
         try:
             context = cls._adapter.get_context().get()
@@ -468,20 +672,30 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             raise
 
         if context is None: # Context-free, no restrictions
-            return list(cls._nodegroup_objects())
-
-        if (permitted_nodegroups := context.get("user_graphs", {}).get(str(cls))):
-            return permitted_nodegroups
+            return cls._unrestricted_permission_view()
+
+        context.setdefault("permission_views", {})
+        if (view := context["permission_views"].get(str(cls))) is None:
+            user = context.get("user")
+            view = cls._adapter.get_permission_cache().get_or_set(
+                "nodegroups",
+                getattr(user, "pk", None),
+                cls.graphid,
+                lambda: PermissionView.build(
+                    cls.graphid,
+                    cls._nodegroup_objects(),
+                    readable=get_readable_nodegroups(user),
+                    writable=get_permitted_nodegroups(user),
+                ),
+            )
+            context["permission_views"][str(cls)] = view
+        return view
 
-        user = context.get("user")
-        png = get_permitted_nodegroups(user)
-        permitted_nodegroups = [
-            key for key in cls._nodegroup_objects()
-            if key in png
-        ] + [None]
-        context.setdefault("user_graphs", {})
-        context["user_graphs"][str(cls)] = permitted_nodegroups
-        return permitted_nodegroups
+    @classmethod
+    @lru_cache
+    def _unrestricted_permission_view(cls):
+        nodegroups = list(cls._nodegroup_objects())
+        return PermissionView.build(cls.graphid, nodegroups, readable=nodegroups, writable=nodegroups)
 
     @classmethod
     @lru_cache
@@ -515,16 +729,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         if hasattr(cls.__bases__[0], "_edges") and cls.proxy:
             return cls.__bases__[0]._edges()
 
-        edge_pairs = [
-            (str(edge.domainnode_id), str(edge.rangenode_id))
-            for edge in Edge.objects.filter(graph_id=cls.graphid)
-        ]
-        edges = {}
-        for domain, rang in edge_pairs:
-            edges.setdefault(domain, [])
-            edges[domain].append(rang)
-
-        return edges
+        return cls._graph_index().edges
 
     @classmethod
     @lru_cache
@@ -541,14 +746,14 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         return cls._nodegroup_objects_real
 
     @classmethod
-    def from_resource_instance(cls, resourceinstance, cross_record=None, lazy=False):
+    def from_resource_instance(cls, resourceinstance, cross_record=None, lazy=False, fields=None):
         """Build a well-known resource from a resource instance."""
 
         if not cls ._can_read_graph():
             raise WKRMPermissionDenied()
 
         resource = Resource(resourceinstance.resourceinstanceid)
-        return cls.from_resource(resource, cross_record=cross_record, lazy=lazy)
+        return cls.from_resource(resource, cross_record=cross_record, lazy=lazy, fields=fields)
 
     def reload(self, ignore_prefetch=True, lazy=False):
         """Reload field values, but not node values for class."""
@@ -589,8 +794,15 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         return self
 
     @classmethod
-    def from_resource(cls, resource, cross_record=None, related_prefetch=None, lazy=False):
-        """Build a well-known resource from an Arches resource."""
+    def from_resource(cls, resource, cross_record=None, related_prefetch=None, lazy=False, tiles=None, fields=None, prefetched=None, readable=False):
+        """Build a well-known resource from an Arches resource.
+
+        If `tiles` is supplied, it is taken to be the full set of permitted tiles
+        for this resource (or, with `fields`, for the projected nodegroups), and
+        no further tile query is made for it. `prefetched` maps related resource
+        IDs to builders, as returned by `_prefetch_related`. If `readable`, the
+        resource has already been through `_readable_resources`.
+        """
 
         if not cls._can_read_graph():
             raise WKRMPermissionDenied()
@@ -602,8 +814,9 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             cross_record=cross_record,
             related_prefetch=related_prefetch,
         )
-        if not wkri._._can_read_resource():
+        if not readable and not wkri._._can_read_resource():
             raise WKRIPermissionDenied()
+        wkri._._prefetched = prefetched
         nodegroup_objs = cls._nodegroup_objects()
         edges = cls._edges()
         values = cls.values_from_resource(
@@ -614,6 +827,8 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             related_prefetch=related_prefetch,
             wkri=wkri,
             lazy=lazy,
+            tiles=tiles,
+            fields=fields,
         )
         wkri._values = ValueList(
             values,
@@ -634,18 +849,24 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             )
 
         if LOAD_ALL_NODES:
-            fltr = {"graph_id": cls.graphid}
+            metadata = load_graph_metadata(cls.graphid)
+            nodes, nodegroups, edge_pairs = metadata.nodes, metadata.nodegroups, metadata.edge_pairs
         else:
             fltr = {"nodeid__in": [alias for alias in cls._wkrm.nodes]}
-        nodes = {str(node.nodeid): node for node in Node.objects.filter(**fltr)}
-        nodegroups = {
-            str(nodegroup.nodegroupid): nodegroup
-            for nodegroup in NodeGroup.objects.filter(
-                nodegroupid__in=[node.nodegroup_id for node in nodes.values()]
-            )
-        }
+            nodes = {str(node.nodeid): node for node in Node.objects.filter(**fltr)}
+            nodegroups = {
+                str(nodegroup.nodegroupid): nodegroup
+                for nodegroup in NodeGroup.objects.filter(
+                    nodegroupid__in=[node.nodegroup_id for node in nodes.values()]
+                )
+            }
+            edge_pairs = [
+                (str(edge.domainnode_id), str(edge.rangenode_id))
+                for edge in Edge.objects.filter(graph_id=cls.graphid)
+            ]
         cls._nodes_real.update(nodes)
         cls._nodegroup_objects_real.update(nodegroups)
+        cls._graph_index_real = GraphIndex.build(nodes, edge_pairs)
 
     @classmethod
     def all_fields(cls):
@@ -717,25 +938,275 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         )
 
     @classmethod
-    def all(cls, related_prefetch=None, lazy=False):
+    def all(cls, related_prefetch=None, lazy=False, fields=None, prefetch=None):
         """Get all resources of this type."""
 
         if not cls ._can_read_graph():
             raise WKRMPermissionDenied()
 
-        resources = Resource.objects.filter(graph_id=cls.graphid).all()
+        return list(cls.iter_all(related_prefetch=related_prefetch, lazy=lazy, fields=fields, prefetch=prefetch))
+
+    @classmethod
+    def iter_all(cls, chunk_size=HYDRATION_BATCH_SIZE, related_prefetch=None, lazy=False, fields=None, prefetch=None):
+        """Iterate over all resources of this type, loading a chunk at a time.
+
+        Resources are paged by resource instance ID, so only one chunk of
+        well-known resources is held by this generator at any moment.
+        """
+
+        if not cls ._can_read_graph():
+            raise WKRMPermissionDenied()
+
+        def _iter_chunks():
+            resources = Resource.objects.filter(graph_id=cls.graphid).order_by("resourceinstanceid")
+            last_id = None
+            while True:
+                page = resources if last_id is None else resources.filter(resourceinstanceid__gt=last_id)
+                chunk = list(page[:chunk_size])
+                if not chunk:
+                    return
+                last_id = chunk[-1].resourceinstanceid
+                wkris = cls._from_resources(
+                    chunk, related_prefetch=related_prefetch, lazy=lazy, fields=fields, prefetch=prefetch
+                )
+                del chunk
+                yield from wkris
+                del wkris
+
+        return _iter_chunks()
+
+    @classmethod
+    def _from_resources(cls, resources, cross_record=None, related_prefetch=None, lazy=False, fields=None, prefetch=None, readable=False):
+        """Build well-known resources from a batch of Arches resources.
+
+        Unless lazy, the permitted tiles for the whole batch are retrieved
+        in one query and shared out by resource instance ID. Resources the
+        user may not read are dropped before any tiles are retrieved, unless
+        `readable` is set to say that they have been checked already.
+        """
+
+        if not readable:
+            resources = cls._readable_resources(resources)
+        if (lazy and fields is None) or not resources:
+            prefetched = cls._prefetch_related(resources, None, prefetch) if prefetch and resources else None
+            return [
+                cls.from_resource(
+                    resource,
+                    cross_record=cross_record,
+                    related_prefetch=related_prefetch,
+                    lazy=lazy,
+                    prefetched=prefetched,
+                    readable=True,
+                )
+                for resource in resources
+            ]
+
+        tiles_by_resource = {resource.resourceinstanceid: [] for resource in resources}
+        tile_filter = {"resourceinstance_id__in": list(tiles_by_resource)}
+        if fields is not None:
+            tile_filter["nodegroup_id__in"] = list(cls._nodegroups_for_fields(tuple(fields)))
+        for tile in cls._get_allowed_tiles(**tile_filter):
+            tiles_by_resource[tile.resourceinstance_id].append(tile)
+
+        prefetched = None
+        if prefetch:
+            # A projection may not have loaded the relationship tiles.
+            prefetched = cls._prefetch_related(
+                resources,
+                sum(tiles_by_resource.values(), []) if fields is None else None,
+                prefetch
+            )
+
         return [
-            cls.from_resource(resource, related_prefetch=related_prefetch, lazy=lazy)
+            cls.from_resource(
+                resource,
+                cross_record=cross_record,
+                related_prefetch=related_prefetch,
+                lazy=lazy,
+                tiles=tiles_by_resource[resource.resourceinstanceid],
+                fields=fields,
+                prefetched=prefetched,
+                readable=True,
+            )
             for resource in resources
         ]
 
     @classmethod
-    def find(cls, resourceinstanceid, from_prefetch=None, lazy=False):
-        """Find an individual well-known resource by instance ID."""
+    def _prefetch_related(cls, resources, tiles, prefetch, strict=True):
+        """Load the resources related through resource-instance nodes in bulk.
+
+        Each prefetch path is a resource-instance node alias, optionally followed
+        by dotted paths to prefetch on the related model. Returns a map of related
+        resource ID to a builder for a hydrated well-known resource, so that each
+        referencing node still gets its own (reparentable) instance.
+        """
+
+        index = cls._graph_index()
+        subpaths = {}
+        for path in prefetch:
+            alias, _, subpath = path.partition(".")
+            if (node := index.nodes_by_alias.get(alias)) is None or node.datatype not in (
+                "resource-instance", "resource-instance-list"
+            ):
+                if strict:
+                    raise KeyError(f"Cannot prefetch {path} as {alias} is not a related resource node on {cls.__name__}")
+                continue
+            subpaths.setdefault(node, [])
+            if subpath:
+                subpaths[node].append(subpath)
+        if not subpaths:
+            return {}
+
+        if tiles is None:
+            tiles = cls._get_allowed_tiles(
+                resourceinstance_id__in=[resource.resourceinstanceid for resource in resources],
+                nodegroup_id__in=list({str(node.nodegroup_id) for node in subpaths}),
+            )
+        related_ids = {}
+        for tile in tiles:
+            for node, node_subpaths in subpaths.items():
+                if tile.nodegroup_id != node.nodegroup_id or not tile.data:
+                    continue
+                value = tile.data.get(str(node.nodeid))
+                for entry in (value if isinstance(value, list) else [value]):
+                    if isinstance(entry, dict):
+                        entry = entry.get("resourceId")
+                    if entry:
+                        related_ids.setdefault(str(entry), [])
+                        related_ids[str(entry)] += node_subpaths
+
+        from arches_orm.wkrm import get_well_known_resource_model_by_graph_id
+
+        related_by_graph = {}
+        for related in Resource.objects.filter(pk__in=list(related_ids)):
+            related_by_graph.setdefault(str(related.graph_id), [])
+            related_by_graph[str(related.graph_id)].append(related)
+
+        prefetched = {}
+        for graph_id, related_resources in related_by_graph.items():
+            if (wkrm := get_well_known_resource_model_by_graph_id(graph_id, default=None)) is None:
+                continue
+            related_cls = wkrm._
+            # Checked once here, so neither tiles are loaded for, nor each build
+            # checks again, resources the user may not read.
+            if not (related_resources := related_cls._readable_resources(related_resources)):
+                continue
+            related_tiles = {related.resourceinstanceid: [] for related in related_resources}
+            for tile in related_cls._get_allowed_tiles(resourceinstance_id__in=list(related_tiles)):
+                related_tiles[tile.resourceinstance_id].append(tile)
+            related_subpaths = list({
+                subpath
+                for related in related_resources
+                for subpath in related_ids[str(related.resourceinstanceid)]
+            })
+            nested = related_cls._prefetch_related(
+                related_resources,
+                [tile for tiles in related_tiles.values() for tile in tiles],
+                related_subpaths,
+                strict=False
+            ) if related_subpaths else None
+            for related in related_resources:
+                prefetched[str(related.resourceinstanceid)] = related_cls._hydrator(
+                    related,
+                    related_tiles[related.resourceinstanceid],
+                    prefetched=nested,
+                    readable=True,
+                )
+        return prefetched
+
+    @classmethod
+    def _hydrator(cls, resource, tiles, prefetched=None, related_prefetch=None, readable=False):
+        """Make a builder of fresh well-known resources from already-loaded tiles.
+
+        Tiles are copied on each build, as pseudo-nodes write back into them.
+        If `readable`, the resource has already been through `_readable_resources`.
+        """
+
+        tiles = list(tiles)
+
+        def _hydrate():
+            return cls.from_resource(
+                resource,
+                related_prefetch=related_prefetch,
+                tiles=[deepcopy(tile) for tile in tiles],
+                prefetched=prefetched,
+                readable=readable,
+            )
+        return _hydrate
+
+    @classmethod
+    def _shared_identity_map(cls, lazy=False, fields=None, prefetch=None):
+        """The identity map, if there is one and instances loaded with these options are shared."""
+
+        # Only fully loaded instances are shared, so a lazy or partial load
+        # never stands in for a full one, nor the other way round.
+        if lazy or fields or prefetch:
+            return None
+        return cls._adapter.get_identity_map()
+
+    @classmethod
+    def find_many(cls, resourceinstanceids, lazy=False, fields=None, prefetch=None):
+        """Find several well-known resources by instance ID.
+
+        Returns a list in the order of the IDs requested, with None for
+        any ID that does not exist.
+        """
 
         if not cls ._can_read_graph():
             raise WKRMPermissionDenied()
 
+        resourceinstanceids = [
+            resourceinstanceid if isinstance(resourceinstanceid, uuid.UUID) else uuid.UUID(str(resourceinstanceid))
+            for resourceinstanceid in resourceinstanceids
+        ]
+        found = {}
+        identity_map = cls._shared_identity_map(lazy=lazy, fields=fields, prefetch=prefetch)
+        if identity_map is not None:
+            for resourceinstanceid in resourceinstanceids:
+                if (wkri := identity_map.get(resourceinstanceid)) and str(wkri._.graphid) == cls.graphid:
+                    found[resourceinstanceid] = wkri
+        resources = {
+            resource.resourceinstanceid: resource
+            for resource in Resource.objects.filter(
+                pk__in=[resourceinstanceid for resourceinstanceid in resourceinstanceids if resourceinstanceid not in found]
+            )
+        }
+        for resource in resources.values():
+            if str(resource.graph_id) != cls.graphid:
+                raise RuntimeError(
+                    f"Using find against wrong resource type: {resource.graph_id} for"
+                    f" {cls.graphid}"
+                )
+
+        resource_list = list(resources.values())
+        if len(cls._readable_resources(resource_list)) < len(resource_list):
+            raise WKRIPermissionDenied()
+        for start in range(0, len(resource_list), HYDRATION_BATCH_SIZE):
+            batch = resource_list[start:start + HYDRATION_BATCH_SIZE]
+            for wkri in cls._from_resources(batch, lazy=lazy, fields=fields, prefetch=prefetch, readable=True):
+                found[wkri.id] = wkri
+                if identity_map is not None:
+                    identity_map.add(wkri)
+        return [found.get(resourceinstanceid) for resourceinstanceid in resourceinstanceids]
+
+    @classmethod
+    def find(cls, resourceinstanceid, from_prefetch=None, lazy=False, fields=None, prefetch=None):
+        """Find an individual well-known resource by instance ID.
+
+        If `fields` is given (as aliases, or dotted paths of aliases), only the
+        nodegroups needed for those are loaded, and the rest load on access.
+        If `prefetch` is given (as related resource aliases, optionally with
+        dotted paths onward), those related resources are loaded in bulk.
+        """
+
+        if not cls ._can_read_graph():
+            raise WKRMPermissionDenied()
+
+        identity_map = cls._shared_identity_map(lazy=lazy, fields=fields, prefetch=prefetch)
+        if identity_map is not None and (wkri := identity_map.get(resourceinstanceid)):
+            if str(wkri._.graphid) == cls.graphid:
+                return wkri
+
         resource = (
             from_prefetch(resourceinstanceid)
             if from_prefetch is not None
@@ -747,7 +1218,15 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                     f"Using find against wrong resource type: {resource.graph_id} for"
                     f" {cls.graphid}"
                 )
-            return cls.from_resource(resource, lazy=lazy)
+            if prefetch:
+                if not (wkris := cls._from_resources([resource], lazy=lazy, fields=fields, prefetch=prefetch)):
+                    raise WKRIPermissionDenied()
+                wkri = wkris[0]
+            else:
+                wkri = cls.from_resource(resource, lazy=lazy, fields=fields)
+            if identity_map is not None:
+                identity_map.add(wkri)
+            return wkri
         return None
 
     def remove(self):
@@ -840,6 +1319,8 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         related_prefetch=None,
         wkri=None,
         lazy=False,
+        tiles=None,
+        fields=None,
     ):
         """Populate fields from the ID-referenced Arches resource."""
 
@@ -851,9 +1332,25 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             for ng, nodegroup in nodegroup_objs.items()
         }
 
+        # A projection loads only what it needs, and leaves the rest unloaded.
+        nodegroups = None
+        if fields is not None:
+            nodegroups = cls._nodegroups_for_fields(tuple(fields))
+            lazy = False
+
         if not lazy:
-            tiles = cls._get_allowed_tiles(resourceinstance=resource)
+            if tiles is None:
+                if nodegroups is None:
+                    tiles = cls._get_allowed_tiles(resourceinstance=resource)
+                else:
+                    tiles = cls._get_allowed_tiles(resourceinstance=resource, nodegroup_id__in=list(nodegroups))
+            tiles_by_nodegroup = {}
+            for tile in tiles:
+                tiles_by_nodegroup.setdefault(tile.nodegroup_id, [])
+                tiles_by_nodegroup[tile.nodegroup_id].append(tile)
             for ng, nodegroup in nodegroup_objs.items():
+                if nodegroups is not None and ng not in nodegroups:
+                    continue
                 all_values.update(
                     cls._ensure_nodegroup(
                         all_values,
@@ -864,28 +1361,53 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                         resource,
                         related_prefetch=related_prefetch,
                         wkri=wkri,
-                        tiles=tiles
+                        tiles_by_nodegroup=tiles_by_nodegroup
                     )
                 )
         return all_values
 
+    @classmethod
+    @lru_cache
+    def _nodegroups_for_fields(cls, fields: tuple[str, ...]) -> frozenset[str]:
+        """Find the nodegroups, with their ancestors, needed to load fields.
+
+        Fields are node aliases, or dotted paths of aliases for nested semantic nodes.
+        """
+
+        index = cls._graph_index()
+        nodegroup_objs = cls._nodegroup_objects()
+        nodegroups = set()
+        for field in fields:
+            for alias in field.split("."):
+                if (node := index.nodes_by_alias.get(alias)) is None:
+                    raise KeyError(f"Unknown field {field} on model {cls.__name__}")
+                nodegroup = str(node.nodegroup_id) if node.nodegroup_id else None
+                while nodegroup in nodegroup_objs and nodegroup not in nodegroups:
+                    nodegroups.add(nodegroup)
+                    nodegroup = index.parent_nodegroups.get(nodegroup)
+        return frozenset(nodegroups)
+
     @classmethod
     def _get_allowed_tiles(
             cls,
             **kwargs
     ):
-        permitted = cls._permitted_nodegroups()
+        permissions = cls._permission_view()
         if "nodegroup_id" in kwargs:
-            nodegroup_id = kwargs["nodegroup_id"]
-            if nodegroup_id is None or nodegroup_id not in permitted:
+            if not permissions.can_read(kwargs["nodegroup_id"]):
                 return []
+        elif "nodegroup_id__in" in kwargs:
+            kwargs["nodegroup_id__in"] = [
+                nodegroup_id for nodegroup_id in kwargs["nodegroup_id__in"]
+                if permissions.can_read(nodegroup_id)
+            ]
         elif any(arg.startswith("nodegroup_id") for arg in kwargs):
             raise NotImplementedError(
                 "Cannot currently filter for permitted nodegroups "
                 "using non-identity nodegroup ID filters."
             )
         else:
-            kwargs["nodegroup_id__in"] = permitted
+            kwargs["nodegroup_id__in"] = list(permissions.readable)
 
         return TileProxyModel.objects.filter(**kwargs)
 
@@ -901,8 +1423,13 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         related_prefetch=None,
         wkri=None,
         add_if_missing=False,
-        tiles=None,
+        tiles_by_nodegroup=None,
     ):
+        """Load a nodegroup, and any nodegroups it implies, into the values.
+
+        If `tiles_by_nodegroup` is given, it must hold every permitted tile of
+        the resource, keyed by nodegroup UUID, and no query is made.
+        """
         nodegroup_id = str(nodegroup_id)
         node = node_objs[nodegroup_id]
         implied_nodegroups = set()
@@ -910,10 +1437,10 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         if value is False or (add_if_missing and value is None):
             if node.alias in all_values:
                 del all_values[node.alias]
-            if tiles is None:
+            if tiles_by_nodegroup is None:
                 nodegroup_tiles = cls._get_allowed_tiles(resourceinstance=resource, nodegroup_id=nodegroup_id)
             else:
-                nodegroup_tiles = [tile for tile in tiles if str(tile.nodegroup_id) == nodegroup_id]
+                nodegroup_tiles = list(tiles_by_nodegroup.get(uuid.UUID(nodegroup_id), []))
             if not nodegroup_tiles and add_if_missing:
                 nodegroup_tiles = [None]
             new_values, new_implied_nodegroups = cls._values_from_resource_nodegroup(
@@ -943,6 +1470,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                     related_prefetch=related_prefetch,
                     wkri=wkri,
                     add_if_missing=True,
+                    tiles_by_nodegroup=tiles_by_nodegroup,
                 )
             implied_nodegroups -= seen_nodegroups
 
@@ -965,6 +1493,7 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         all_values = {}
 
         implied_nodegroups = set()
+        parent_nodegroups = cls._graph_index().parent_nodegroups
 
         def _add_node(node: Node, tile: TileProxyModel | None) -> None:
             key = node.alias
@@ -975,14 +1504,8 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             # We shouldn't have to take care of this case, as it should already
             # be included below.
             # if tile.parenttile_id:
-            for domain, ranges in edges.items():
-                if str(node.nodegroup_id) in ranges:
-                    implied_nodegroups.add(
-                        str(node_objs[domain].nodegroup_id)
-                        if node_objs[domain].nodegroup_id
-                        else str(node_objs[domain].nodeid)  # for root
-                    )
-                    break
+            if (parent_nodegroup := parent_nodegroups.get(str(node.nodegroup_id))):
+                implied_nodegroups.add(parent_nodegroup)
             if isinstance(pseudo_node, PseudoNodeList):
                 if all_values.get(key, False) is not False:
                     for pseudo_node_list in all_values[key]:
@@ -1012,17 +1535,17 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         return all_values, implied_nodegroups
 
     @classmethod
-    def first(cls, cross_record=None, lazy=False, case_i=False, **kwargs):
+    def first(cls, cross_record=None, lazy=False, case_i=False, fields=None, prefetch=None, **kwargs):
         if not cls ._can_read_graph():
             raise WKRMPermissionDenied()
 
-        found = cls.where(cross_record=cross_record, lazy=lazy, case_i=case_i, **kwargs)
+        found = cls.where(cross_record=cross_record, lazy=lazy, case_i=case_i, fields=fields, prefetch=prefetch, **kwargs)
         if not found:
             raise RuntimeError(f"No results for search of {', '.join(kwargs.keys())}")
         return found[0]
 
     @classmethod
-    def where(cls, cross_record=None, lazy=False, case_i=False, **kwargs):
+    def where(cls, cross_record=None, lazy=False, case_i=False, fields=None, prefetch=None, **kwargs):
         """Do a filtered query returning a list of well-known resources."""
 
         if not cls ._can_read_graph():
@@ -1058,18 +1581,22 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             contains_key: contains_value
         }
         tiles = cls._get_allowed_tiles(**filter_args)
-        return [
-            cls.from_resource_instance(tile.resourceinstance, cross_record=cross_record, lazy=lazy)
-            for tile in tiles
-        ]
+        # A resource may have several matching tiles, but is only loaded once.
+        resourceinstanceids = dict.fromkeys(tile.resourceinstance_id for tile in tiles)
+        return cls._from_resources(
+            [Resource(resourceinstanceid) for resourceinstanceid in resourceinstanceids],
+            cross_record=cross_record,
+            lazy=lazy,
+            fields=fields,
+            prefetch=prefetch,
+        )
 
     @classmethod
     def _make_pseudo_node_cls(cls, key, single=False, tile=None, wkri=None):
         node_obj = cls._node_objects_by_alias()[key]
         nodegroups = cls._nodegroup_objects()
 
-        permitted = cls._permitted_nodegroups()
-        edges = cls._edges().get(str(node_obj.nodeid))
+        permissions = cls._permission_view()
         value = None
         if (
             node_obj.nodegroup_id
@@ -1083,16 +1610,8 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                 parent_cls=cls.view_model,
             )
         if value is None or tile:
-            child_nodes = {}
-            if edges is not None:
-                child_nodes.update(
-                    {
-                        n.alias: (n, not n.is_collector)
-                        for n in cls._node_objects().values()
-                        if str(n.nodeid) in edges
-                    }
-                )
-            if node_obj.nodegroup_id is not None and str(node_obj.nodegroup_id) not in permitted:
+            child_nodes = cls._graph_index().child_nodes[str(node_obj.nodeid)]
+            if node_obj.nodegroup_id is not None and not permissions.can_read(node_obj.nodegroup_id):
                 node_value = PseudoNodeUnavailable(
                     node=node_obj,
                     parent=wkri,
@@ -1125,12 +1644,14 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
             # We should not actually fail without a graph...
             cls._nodes_real = {}
             cls._nodegroup_objects_real = {}
+            cls._graph_index_real = None
 
     @classmethod
     def _add_events(cls):
         cls.post_save = Signal()
         cls.post_related_to = Signal()
         cls.post_related_from = Signal()
+        cls.post_bulk_delete = Signal()
 
     @classmethod
     @lru_cache
@@ -1167,10 +1688,59 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
                 self._values[node.alias] = [value]
             return value
 
+    def index(self):
+        """Index the stored resource, saving it first if it is new.
+
+        This goes through the adapter, so may be deferred.
+        """
+        if not self.id:
+            self.to_resource(strict=True)
+        else:
+            self._adapter.index(type(self), [self.id])
+        return self
+
     def delete(self):
         """Delete the underlying resource."""
+        if (identity_map := self._adapter.get_identity_map()) is not None:
+            identity_map.discard(self.id)
         return self.resource.delete()
 
+    @classmethod
+    def delete_bulk(cls, resourceinstanceids, do_index: bool = True):
+        """Delete many resources of this model at once.
+
+        Tiles, relationships and resources are removed with set-based SQL in a
+        single transaction, rather than one by one, so per-tile hooks are not
+        called. Instead, `post_bulk_delete` is sent once, with the IDs deleted,
+        which are returned.
+        """
+        if not cls ._can_read_graph():
+            raise WKRMPermissionDenied()
+
+        resourceinstanceids = [str(resourceinstanceid) for resourceinstanceid in resourceinstanceids]
+        other_graphs = Resource.objects.filter(
+            resourceinstanceid__in=resourceinstanceids
+        ).exclude(graph_id=cls.graphid).values_list("graph_id", flat=True)
+        if (graph_id := next(iter(other_graphs), None)):
+            raise RuntimeError(
+                f"Using delete_bulk against wrong resource type: {graph_id} for"
+                f" {cls.graphid}"
+            )
+        if (user := cls._context_get("user")):
+            if deletable_resource_ids(user, resourceinstanceids, cls.graphid) != set(resourceinstanceids):
+                raise WKRIPermissionDenied()
+
+        if (identity_map := cls._adapter.get_identity_map()) is not None:
+            for resourceinstanceid in resourceinstanceids:
+                identity_map.discard(resourceinstanceid)
+
+        deleted, referring = delete_resources(resourceinstanceids, user=user)
+        if do_index:
+            deindex_resources(deleted, referring)
+        if deleted:
+            cls.post_bulk_delete.send(cls, resourceinstanceids=deleted, reason="bulk delete")
+        return deleted
+
     @classmethod
     def create(cls, _no_save=False, _do_index=True, **kwargs):
         if not cls ._can_read_graph():
@@ -1182,21 +1752,156 @@ class ArchesDjangoResourceWrapper(SearchMixin, ResourceWrapper, proxy=True):
         return inst
 
     @classmethod
-    def create_bulk(cls, fields: list, do_index: bool = True):
+    def create_bulk(
+        cls,
+        fields: list,
+        do_index: bool = True,
+        processes: int | None = None,
+        report: LoadReport | None = None,
+    ):
+        """Create many resources in a single bulk load.
+
+        If `processes` is more than one, resources are built from the field
+        sets in that many forked worker processes, and the results merged into
+        one load, which is then indexed by as many processes. If a `report` is
+        given, the timing of each phase of the load is added to it.
+        """
         if not cls ._can_read_graph():
             raise WKRMPermissionDenied()
 
+        return cls._create_bulk(fields, BulkImportWKRM(report=report), do_index=do_index, processes=processes)
+
+    @classmethod
+    def create_bulk_iter(
+        cls,
+        fields: Iterable[dict],
+        batch_size: int = 1000,
+        do_index: bool = True,
+        processes: int | None = None,
+        checkpoint: str | None = None,
+        report: LoadReport | None = None,
+    ):
+        """Create resources from an iterable of field sets, one bulk load per batch.
+
+        Only one batch of field sets is held at a time, and each is written as
+        its own load event. This yields the resources created in each batch,
+        and raises a RuntimeError if a batch fails, after which earlier batches
+        remain written.
+
+        If a `checkpoint` name is given, batches are recorded against it, and a
+        later run with the same name, batch size and input skips batches that
+        were already written (and, if `do_index`, indexed); a rerun with another
+        batch size raises a RuntimeError. If a `report` is given, the timings of
+        every batch are added to it.
+
+        Permissions and checkpoints are checked when this is called, rather
+        than when iteration starts.
+        """
+        if not cls ._can_read_graph():
+            raise WKRMPermissionDenied()
+
+        done = completed_batches(checkpoint, batch_size, indexed=do_index) if checkpoint else set()
+        return cls._create_bulk_batches(
+            iter(fields), batch_size, done, do_index=do_index, processes=processes, checkpoint=checkpoint, report=report
+        )
+
+    @classmethod
+    def _create_bulk_batches(
+        cls,
+        fields: Iterator[dict],
+        batch_size: int,
+        done: set[int],
+        do_index: bool = True,
+        processes: int | None = None,
+        checkpoint: str | None = None,
+        report: LoadReport | None = None,
+    ):
+        for batch in itertools.count():
+            field_sets = list(itertools.islice(fields, batch_size))
+            if not field_sets:
+                return
+            if batch in done:
+                logger.info(f"create_bulk_iter: skipping batch {batch} of {checkpoint}, already loaded")
+                continue
+
+            logger.info(f"create_bulk_iter: batch {batch} ({len(field_sets)} resources)")
+            bulk_etl = BulkImportWKRM(
+                load_description=CHECKPOINT_DESCRIPTION.format(checkpoint=checkpoint, batch=batch, batch_size=batch_size)
+                if checkpoint else None,
+                report=report,
+            )
+            result = cls._create_bulk(field_sets, bulk_etl, do_index=do_index, processes=processes)
+            if not isinstance(result, list) or not result:
+                raise RuntimeError(f"Bulk load of batch {batch} failed (load {bulk_etl.loadid}): {result}")
+            yield result
+
+    @classmethod
+    def update_bulk(
+        cls,
+        changes: Iterable[tuple[Any, dict]],
+        do_index: bool = True,
+        report: LoadReport | None = None,
+    ):
+        """Update many existing resources in a single bulk load.
+
+        Each change is a resource instance ID and a dictionary of field values
+        to set, keyed by alias, or dotted path of aliases, as for `create`. Only the nodegroups holding those fields are
+        loaded, and only tiles that then differ are staged, as updates, so
+        they are validated and written together, as by `create_bulk`, which
+        also describes `report`.
+        """
+        if not cls ._can_read_graph():
+            raise WKRMPermissionDenied()
+
+        bulk_etl = BulkImportWKRM(report=report)
+        changes = list(changes)
+        with bulk_etl.report.span("build", rows=len(changes)):
+            fields = sorted({key for _, values in changes for key in values})
+            found = cls.find_many([resourceinstanceid for resourceinstanceid, _ in changes], fields=fields)
+            wkris = {}
+            for (resourceinstanceid, values), wkri in zip(changes, found):
+                if wkri is None:
+                    raise Resource.DoesNotExist(f"No {cls.__name__} resource {resourceinstanceid}")
+                if not wkri._._can_edit_resource():
+                    raise WKRIPermissionDenied()
+                for key, value in values.items():
+                    level = wkri
+                    for token in key.split(".")[:-1]:
+                        level = getattr(level, token)
+                    setattr(level, key.split(".")[-1], value)
+                wkris[wkri._.id] = wkri._
+
+            pending_saves = [wkri._prepare_save() for wkri in wkris.values()]
+            crosses = reconcile_crosses(
+                pending_saves,
+                save_crosses=cls._adapter.config.get("save_crosses", False),
+            )
+        result = bulk_etl.write_updates(pending_saves, crosses, do_index=do_index)
+        if not isinstance(result, list) or (pending_saves and not result):
+            return result
+        return [wkri.view_model_inst for wkri in wkris.values()]
+
+    @classmethod
+    def _create_bulk(cls, fields: list, bulk_etl: BulkImportWKRM, do_index: bool = True, processes: int | None = None):
+        if processes and processes > 1:
+            with bulk_etl.report.span("build", rows=len(fields)):
+                records = build_records_in_pool(cls, fields, processes=processes)
+            result = bulk_etl.write_records(records, do_index=do_index, processes=processes)
+            if not isinstance(result, list) or not result:
+                return result
+            return cls.find_many(result, lazy=True)
+
         requested_wkrms = []
-        for n, field_set in enumerate(fields):
-            try:
-                if n % 10 == 0:
-                    logger.info(f"create_bulk: {n} / {len(fields)}")
-                requested_wkrms.append(cls.create(_no_save=True, _do_index=do_index, **field_set))
-            except Exception:
-                logger.error(f"Failed item {n}")
-                raise
-        bulk_etl = BulkImportWKRM()
-        return bulk_etl.write(requested_wkrms, do_index=do_index)
+        with bulk_etl.report.span("build", rows=len(fields)):
+            for n, field_set in enumerate(fields):
+                try:
+                    if n % 10 == 0:
+                        logger.info(f"create_bulk: {n} / {len(fields)}")
+                    requested_wkrms.append(cls.create(_no_save=True, _do_index=do_index, **field_set))
+                except Exception:
+                    logger.error(f"Failed item {n}")
+                    raise
+        return bulk_etl.write(requested_wkrms, do_index=do_index, processes=processes)
 
     @staticmethod
     def get_adapter():
@@ -19,7 +19,7 @@ class DummyAdapter(Adapter):
 
         return ResourceWrapper
 
-    def load_from_id(self, resource_id, from_prefetch=None):
+    def load_from_id(self, resource_id, from_prefetch=None, lazy=False, related=False):
         return (
             from_prefetch(resource_id)
             if from_prefetch is not None
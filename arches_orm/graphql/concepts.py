@@ -18,6 +18,7 @@ from aiodataloader import DataLoader
 from arches_orm.wkrm import get_resource_models_for_adapter
 from arches_orm.datatypes import DataTypeNames
 from arches_orm.arches_django.datatypes.concepts import invalidate_collection, retrieve_collection
+from arches_orm.arches_django.graph_cache import node_aliases, node_datatypes
 
 from arches.app.utils.skos import SKOSReader
 from arches.app.models import models
@@ -51,8 +52,8 @@ class DataTypes:
     @context_free
     def init(self):
         if not self.inited:
-            self.node_datatypes = {str(nodeid): datatype for nodeid, datatype in models.Node.objects.values_list("nodeid", "datatype")}
-            self.node_aliases = {str(nodeid): alias for nodeid, alias in models.Node.objects.values_list("nodeid", "alias")}
+            self.node_datatypes = node_datatypes()
+            self.node_aliases = node_aliases()
             self.node_concepts = {}
             self.datatype_factory = DataTypeFactory()
 
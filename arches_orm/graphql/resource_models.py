@@ -13,8 +13,8 @@ import graphene
 
 from aiodataloader import DataLoader
 from arches_orm.wkrm import WELL_KNOWN_RESOURCE_MODELS
+from arches_orm.arches_django.graph_cache import node_collections, node_datatypes
 
-from arches.app.models import models
 from arches.app.models.concept import Concept
 from django.utils.translation import get_language
 
@@ -30,18 +30,12 @@ class DataTypes:
 
     def init(self):
         allowed_graphs = None if ALLOW_NON_WKRM_GRAPHS else {wkrm.graphid for wkrm in WELL_KNOWN_RESOURCE_MODELS}
-        self.node_datatypes = {str(nodeid): datatype for nodeid, datatype in models.Node.objects.values_list("nodeid", "datatype")}
-        self.node_concepts = {}
+        self.node_datatypes = node_datatypes()
         self.graphs = {
             str(name): pk for pk, name in Graph.objects.values_list("pk", "name")
             if (allowed_graphs is None or str(pk) in allowed_graphs)
         }
-        for graphid in self.graphs.values():
-            self.node_concepts.update({
-                str(node_id): config["rdmCollection"]
-                for node_id, config in
-                models.Node.objects.filter(graph_id=graphid).exclude(config__rdmCollection__isnull=True).values_list("nodeid", "config")
-            })
+        self.node_concepts = node_collections([str(graphid) for graphid in self.graphs.values()])
 
 data_types = DataTypes()
 
@@ -27,6 +27,7 @@ from arches_orm.view_models._base import ResourceInstanceViewModel as WKRI
 from arches_orm.wkrm import attempt_well_known_resource_model, get_well_known_resource_model_by_class_name
 from arches_orm.wkrm import WELL_KNOWN_RESOURCE_MODELS
 from arches_orm.wkrm import get_resource_models_for_adapter
+from arches_orm.arches_django.graph_cache import node_datatypes
 
 from arches.app.models import models
 import arches.app.models.resource
@@ -125,7 +126,7 @@ class DataTypes:
     def init(self):
         if not self.inited:
             try:
-                self.node_datatypes = {str(nodeid): datatype for nodeid, datatype in models.Node.objects.values_list("nodeid", "datatype")}
+                self.node_datatypes = node_datatypes()
                 self.datatype_factory = DataTypeFactory()
                 orm_models = get_resource_models_for_adapter()["by-class"]
                 self.graphs = {
@@ -604,9 +605,7 @@ with get_adapter().context_free() as _:
             }
         try:
             resource = await _build_resource(resource_cls, **field_set)
-            await sync_to_async(resource._.to_resource)()
-            if do_index:
-                await sync_to_async(resource._.index)()
+            await sync_to_async(resource._.to_resource)(_do_index=do_index)
         except (WKRMPermissionDenied, WKRIPermissionDenied) as exc:
             if GRAPHQL_DEBUG_PERMISSIONS:
                 logging.exception(exc)
@@ -0,0 +1,69 @@
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class IdentityMap:
+    """Well-known resources already loaded within one adapter context.
+
+    Top-level loads share a single instance per resource ID. Related loads
+    cannot share an instance, as each records the resource it is related
+    from, so for those we keep a builder that rehydrates without querying.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(self):
+        self._instances: dict[str, Any] = {}
+        self._builders: dict[str, Callable[[], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, resource_id) -> Any | None:
+        instance = self._instances.get(str(resource_id))
+        # Once related from somewhere, an instance is no longer shareable.
+        if instance is not None and instance._._cross_record:
+            del self._instances[str(resource_id)]
+            instance = None
+        self._count(instance)
+        return instance
+
+    def add(self, instance) -> None:
+        if instance is not None and instance.id and not instance._._cross_record:
+            self._instances[str(instance.id)] = instance
+
+    def get_builder(self, resource_id) -> Callable[[], Any] | None:
+        builder = self._builders.get(str(resource_id))
+        self._count(builder)
+        return builder
+
+    def add_builder(self, resource_id, builder: Callable[[], Any]) -> None:
+        self._builders[str(resource_id)] = builder
+
+    def discard(self, resource_id) -> None:
+        """Forget a resource, for instance, because it has been saved or deleted."""
+        self._instances.pop(str(resource_id), None)
+        self._builders.pop(str(resource_id), None)
+
+    def clear(self) -> None:
+        self._instances.clear()
+        self._builders.clear()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._instances) + len(self._builders),
+        }
+
+    def _count(self, found) -> None:
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    def __len__(self):
+        return len(self._instances) + len(self._builders)
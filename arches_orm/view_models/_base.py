@@ -1,6 +1,9 @@
 import logging
 
 class ViewModel:
+    # Empty, so that subclasses may be slotted.
+    __slots__ = ()
+
     _parent_pseudo_node = None
 
 class ResourceModelViewModel(type, ViewModel):
@@ -12,14 +15,20 @@ class ResourceModelViewModel(type, ViewModel):
 
         if key in (
                 "save",
+                "save_many",
                 "create",
                 "find",
+                "find_many",
                 "all",
+                "iter_all",
                 "first",
                 "where",
                 "search",
                 "delete",
+                "delete_bulk",
                 "create_bulk",
+                "create_bulk_iter",
+                "update_bulk",
                 "reload"
             ):
             return getattr(self._, key)
@@ -7,13 +7,17 @@ from ._base import (
 class SemanticViewModel(ViewModel, Mapping[str, ViewModel]):
     """Wraps a semantic tile."""
 
-    _child_keys = None
-    _parent_wkri = None
-    _make_child = None
-    _get_child_values = None
-    _child_values = None
+    __slots__ = (
+        "_child_keys",
+        "_parent_wkri",
+        "_make_child",
+        "_get_child_values",
+        "_child_values",
+        "_parent_pseudo_node",
+    )
 
     def __init__(self, parent_wkri, child_keys, make_child, get_child_values):
+        self._parent_pseudo_node = None
         self._child_keys = child_keys
         self._child_values = {}
         self._parent_wkri = parent_wkri
@@ -50,8 +54,8 @@ class SemanticViewModel(ViewModel, Mapping[str, ViewModel]):
         return children
 
     def __getattr__(self, key):
-        if key in self.__dict__:
-            return super().__getattr__(key)
+        if key in self.__slots__:
+            raise AttributeError(key)
 
         child_value = self._get_child_value(key)
         return child_value.value
@@ -68,14 +72,7 @@ class SemanticViewModel(ViewModel, Mapping[str, ViewModel]):
         return self._child_values[key]
 
     def __setattr__(self, key, value):
-        if key in (
-            "_child_keys",
-            "_parent_wkri",
-            "_child_values",
-            "_make_child",
-            "_parent_pseudo_node",
-            "_get_child_values",
-        ):
+        if key in self.__slots__:
             return super().__setattr__(key, value)
 
         if key not in self._child_keys:
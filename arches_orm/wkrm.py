@@ -108,17 +108,18 @@ def get_well_known_resource_model_by_graph_id(
 
 
 def attempt_well_known_resource_model(
-    resource_id, from_prefetch=None, adapter=None, lazy=False, **kwargs
+    resource_id, from_prefetch=None, adapter=None, lazy=False, related=False, **kwargs
 ):
     """Attempts to find and create a well-known resource from a resource ID
 
     This is the simplest entry-point if you do not know the model of the resource
     you have. Bear in mind, it will return None if a well-known resource model
-    is not matched.
+    is not matched. If `related` is set, the instance returned is never shared
+    with other loads, as it is expected to be attached to a parent.
     """
 
     return get_adapter(adapter).load_from_id(
-        resource_id=resource_id, from_prefetch=from_prefetch, lazy=lazy
+        resource_id=resource_id, from_prefetch=from_prefetch, lazy=lazy, related=related
     )
 
 get_resource_models_for_adapter()
@@ -65,6 +65,7 @@ class ResourceWrapper(ABC):
             "_description",
             "_cross_record",
             "_related_prefetch",
+            "_prefetched",
             "_pending_relationships",
             "_model_remapping", # NOTE: Note that this is not safe against rewriting
             "__class__",
@@ -188,6 +189,18 @@ class ResourceWrapper(ABC):
     def create_bulk(cls, fields: list, do_index: bool = True):
         raise NotImplementedError("The bulk_create module needs to be rewritten")
 
+    @classmethod
+    def create_bulk_iter(cls, fields, batch_size: int = 1000, do_index: bool = True, checkpoint: str | None = None):
+        raise NotImplementedError("Batched bulk creation is not supported by this adapter")
+
+    @classmethod
+    def update_bulk(cls, changes, do_index: bool = True):
+        raise NotImplementedError("Bulk updates are not supported by this adapter")
+
+    @classmethod
+    def delete_bulk(cls, resourceinstanceids, do_index: bool = True):
+        raise NotImplementedError("Bulk deletion is not supported by this adapter")
+
     @classmethod
     def create(cls, _no_save=False, _do_index=True, **kwargs):
         """Create a new well-known resource and Arches resource from field values."""
@@ -237,12 +250,24 @@ class ResourceWrapper(ABC):
         resource.index()
         return self
 
-    def save(self):
-        """Rebuild and save the underlying resource."""
-        resource = self.to_resource(strict=True, _no_save=False)
+    def save(self, full_save=False, refetch=False):
+        """Rebuild and save the underlying resource.
+
+        By default, only changed tiles are written, if the adapter supports it,
+        and the stored resource is only reloaded if `refetch` is set.
+        """
+        resource = self.to_resource(strict=True, _no_save=False, full_save=full_save, refetch=refetch)
         self.id = resource.pk
         return self
 
+    @classmethod
+    def save_many(cls, wkris, full_save=False):
+        """Save several well-known resources.
+
+        Adapters should override this where they can save in bulk.
+        """
+        return [wkri.save(full_save=full_save) for wkri in wkris]
+
     def describe(self):
         """Give a textual description of this well-known resource."""
         from tabulate import tabulate
@@ -301,10 +326,26 @@ class ResourceWrapper(ABC):
     def all(cls, related_prefetch=None):
         """Get all resources of this type."""
 
+    @classmethod
+    def iter_all(cls, chunk_size=None, related_prefetch=None, lazy=False):
+        """Iterate over all resources of this type.
+
+        Adapters should override this where they can page through results.
+        """
+        yield from cls.all(related_prefetch=related_prefetch)
+
     @abstractclassmethod
     def find(cls, resourceinstanceid):
         """Find an individual well-known resource by instance ID."""
 
+    @classmethod
+    def find_many(cls, resourceinstanceids, lazy=False):
+        """Find several well-known resources by instance ID.
+
+        Adapters should override this where they can load in bulk.
+        """
+        return [cls.find(resourceinstanceid) for resourceinstanceid in resourceinstanceids]
+
     @abstractmethod
     def delete(self):
         """Delete the underlying resource."""
@@ -150,3 +150,6 @@ def arches_orm(search_engine, django_db_blocker, test_sql):
         import arches_orm.models
 
         yield arches_orm
+
+        # User IDs may be reused between tests, so permissions cached in one may not carry over.
+        get_adapter("arches-django").invalidate_permissions()
@@ -300,6 +300,47 @@ def test_can_save_two_related_resources(arches_orm, person_ashs, lazy):
     reloaded_person = arches_orm.models.Person.find(person_ashs.id, lazy=lazy)
     assert len(reloaded_person.associated_activities) == 2
 
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("lazy", [False, True])
+def test_can_prefetch_related_resources(arches_orm, person_ashs, lazy):
+    act_1 = arches_orm.models.Activity()
+    act_2 = arches_orm.models.Activity()
+    person_ashs.associated_activities.append(act_1)
+    person_ashs.associated_activities.append(act_2)
+    person_ashs.save()
+
+    reloaded_person = arches_orm.models.Person.find(person_ashs.id, lazy=lazy, prefetch=["associated_activities"])
+    assert set(reloaded_person._._prefetched) == {str(act_1.id), str(act_2.id)}
+    assert {activity.id for activity in reloaded_person.associated_activities} == {act_1.id, act_2.id}
+
+    with pytest.raises(KeyError):
+        arches_orm.models.Person.find(person_ashs.id, prefetch=["name"])
+
+@pytest.mark.django_db
+@context_free
+def test_prefetch_checks_related_resources_once(arches_orm, person_ashs, monkeypatch):
+    Activity = arches_orm.models.Activity
+    act_1, act_2 = Activity(), Activity()
+    person_ashs.associated_activities.append(act_1)
+    person_ashs.associated_activities.append(act_2)
+    person_ashs.save()
+
+    readable_resources = Activity._._readable_resources
+    checked = []
+    def _readable_resources(resources):
+        checked.append({str(resource.resourceinstanceid) for resource in resources})
+        return [resource for resource in readable_resources(resources) if resource.resourceinstanceid != act_2.id]
+    def _can_read_resource(self, resource=None):
+        raise AssertionError("Prefetched resources should not be checked again")
+    monkeypatch.setattr(Activity._, "_readable_resources", _readable_resources)
+    monkeypatch.setattr(Activity._, "_can_read_resource", _can_read_resource)
+
+    reloaded_person = arches_orm.models.Person.find(person_ashs.id, prefetch=["associated_activities"])
+    assert checked == [{str(act_1.id), str(act_2.id)}]
+    assert set(reloaded_person._._prefetched) == {str(act_1.id)}
+    assert reloaded_person._._prefetched[str(act_1.id)]().id == act_1.id
+
 @pytest.mark.django_db
 @context_free
 @pytest.mark.parametrize("lazy", [False, True])
@@ -341,6 +382,75 @@ def test_find(arches_orm, person_ashs, lazy):
     reloaded_person = arches_orm.models.Person.find(person_ashs.id, lazy=lazy)
     assert reloaded_person.name[0].full_name == "Ash"
 
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("lazy", [False, True])
+def test_find_many(arches_orm, person_ashs, lazy):
+    import uuid
+    Person = arches_orm.models.Person
+    person = Person.create()
+    person.name.append().full_name = "Asha"
+    person.save()
+
+    missing = uuid.uuid4()
+    reloaded_people = Person.find_many([person.id, missing, person_ashs.id], lazy=lazy)
+    assert reloaded_people[1] is None
+    assert reloaded_people[0].name[0].full_name == "Asha"
+    assert reloaded_people[2].name[0].full_name == "Ash"
+
+@pytest.mark.django_db
+@context_free
+def test_where_loads_each_resource_once(arches_orm, person_ashs, monkeypatch):
+    Person = arches_orm.models.Person
+    get_allowed_tiles = Person._._get_allowed_tiles
+
+    # Every name tile matches, each twice, as if several tiles of the resource did.
+    def _get_allowed_tiles(**kwargs):
+        if not any(key.startswith("data__") for key in kwargs):
+            return get_allowed_tiles(**kwargs)
+        tiles = list(get_allowed_tiles(nodegroup_id=kwargs["nodegroup_id"]))
+        return tiles + tiles
+    monkeypatch.setattr(Person._, "_get_allowed_tiles", _get_allowed_tiles)
+
+    people = Person.where(full_name="Ash")
+    assert [person.id for person in people] == [person_ashs.id]
+    assert people[0].name[0].full_name == "Ash"
+
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("lazy", [False, True])
+def test_all(arches_orm, person_ashs, lazy):
+    people = arches_orm.models.Person.all(lazy=lazy)
+    assert [person.name[0].full_name for person in people] == ["Ash"]
+
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("lazy", [False, True])
+def test_iter_all(arches_orm, person_ashs, lazy):
+    Person = arches_orm.models.Person
+    person = Person.create()
+    person.name.append().full_name = "Asha"
+    person.save()
+
+    people = Person.iter_all(chunk_size=1, lazy=lazy)
+    assert not isinstance(people, list)
+    full_names = {person.name[0].full_name for person in people}
+    assert full_names == {"Ash", "Asha"}
+
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("lazy", [False, True])
+def test_find_with_fields(arches_orm, person_ashs, lazy):
+    reloaded_person = arches_orm.models.Person.find(person_ashs.id, lazy=lazy, fields=["name.full_name"])
+    values = reloaded_person._._values._values
+    assert values["name"] is not False
+    assert any(value is False for value in values.values())
+    assert reloaded_person.name[0].full_name == "Ash"
+    assert not reloaded_person.user_account
+
+    with pytest.raises(KeyError):
+        arches_orm.models.Person.find(person_ashs.id, fields=["name.not_a_node"])
+
 @pytest.mark.django_db
 @context_free
 @pytest.mark.parametrize("lazy", [False, True])
@@ -408,3 +518,727 @@ def test_can_attach_related_then_save(arches_orm, person_ashs, lazy):
     reloaded_person = arches_orm.models.Person.find(person_ashs.id)
     assert len(reloaded_person.associated_activities) == 1
     assert isinstance(reloaded_person.associated_activities[0], arches_orm.models.Activity)
+
+@pytest.mark.django_db
+@context_free
+def test_graph_cache_is_used_when_current(arches_orm, tmp_path):
+    from arches_orm.adapter import get_adapter
+    from arches_orm.arches_django import graph_cache
+
+    graphid = arches_orm.models.Person.graphid
+    path = graph_cache.write_graph_cache([graphid], path=tmp_path / "graphs.pickle")
+    config = get_adapter("arches-django").config
+    config["graph_cache_path"] = str(path)
+    try:
+        metadata = graph_cache.load_graph_metadata(graphid)
+        assert metadata is graph_cache._read_graph_cache(path)[graphid]
+        assert set(metadata.nodes) == set(arches_orm.models.Person._node_objects())
+        assert set(metadata.datatypes.items()) <= set(graph_cache.node_datatypes().items())
+
+        # Graphs missing from the cache, or stale in it, are read from the database.
+        activity_nodes = set(arches_orm.models.Activity._node_objects())
+        assert activity_nodes <= set(graph_cache.node_datatypes())
+        assert activity_nodes <= set(graph_cache.node_aliases())
+        nodeid = next(iter(metadata.datatypes))
+        datatype = metadata.datatypes[nodeid]
+        metadata.datatypes[nodeid] = "cached"
+        assert graph_cache.node_datatypes([graphid])[nodeid] == "cached"
+        metadata.publication_id = "stale"
+        assert graph_cache.node_datatypes([graphid])[nodeid] == datatype
+    finally:
+        del config["graph_cache_path"]
+        graph_cache._read_graph_cache.cache_clear()
+
+@pytest.mark.django_db
+@context_free
+@pytest.mark.parametrize("full_save", [False, True])
+def test_save_writes_only_changed_tiles(arches_orm, person_ashs, full_save):
+    from unittest.mock import patch
+    from arches.app.models.tile import Tile
+
+    person_ashs.name.append().full_name = "Asha"
+    person_ashs.save()
+
+    reloaded_person = arches_orm.models.Person.find(person_ashs.id)
+    reloaded_person.name[1].full_name = "Ashb"
+    with patch.object(Tile, "save", autospec=True, side_effect=Tile.save) as tile_save:
+        reloaded_person.save(full_save=full_save)
+    if full_save:
+        saved = {str(call.args[0].tileid) for call in tile_save.call_args_list}
+        assert saved == {str(tile.tileid) for tile in reloaded_person._.resource.tiles}
+    else:
+        assert tile_save.call_count == 1
+
+    reloaded_person = arches_orm.models.Person.find(person_ashs.id)
+    full_names = {name.full_name for name in reloaded_person.name}
+    assert full_names == {"Ash", "Ashb"}
+
+@pytest.mark.django_db
+@context_free
+def test_new_resource_with_related_is_saved_once(arches_orm):
+    from unittest.mock import patch
+    from arches.app.models.resource import Resource
+
+    person = arches_orm.models.Person()
+    person.name.append().full_name = "Ash"
+    person.associated_activities.append(arches_orm.models.Activity())
+    with patch.object(Resource, "save", autospec=True, side_effect=Resource.save) as resource_save:
+        person.save()
+    # Once for the related activity, and once for the person.
+    assert resource_save.call_count == 2
+
+    reloaded_person = arches_orm.models.Person.find(person.id)
+    assert len(reloaded_person.associated_activities) == 1
+    assert reloaded_person.associated_activities[0].id == person.associated_activities[0].id
+
+@pytest.mark.django_db
+@context_free
+def test_save_many_reconciles_crosses(arches_orm):
+    from arches.app.models.models import ResourceXResource
+
+    activity = arches_orm.models.Activity()
+    activity.save()
+    people = []
+    for name in ("Ash", "Asha"):
+        person = arches_orm.models.Person()
+        person.name.append().full_name = name
+        person.associated_activities.append(activity)
+        people.append(person)
+    arches_orm.models.Person.save_many(people)
+
+    crosses = ResourceXResource.objects.filter(resourceinstanceidto_id=activity.id)
+    assert {str(cross.resourceinstanceidfrom_id) for cross in crosses} == {str(person.id) for person in people}
+
+    # Saving again finds the existing crosses, rather than adding more.
+    people = arches_orm.models.Person.find_many([person.id for person in people])
+    people[1].associated_activities.clear()
+    arches_orm.models.Person.save_many(people)
+    crosses = ResourceXResource.objects.filter(resourceinstanceidto_id=activity.id)
+    assert [str(cross.resourceinstanceidfrom_id) for cross in crosses] == [str(people[0].id)]
+
+def test_staging_writer_copies_or_batches(arches_orm):
+    from unittest.mock import MagicMock
+    from arches_orm.arches_django.staging import STAGING_COLUMNS, StagingRow, StagingWriter
+
+    rows = [
+        StagingRow(
+            nodegroupid=f"ng{n}", legacyid="r", resourceid="r", tileid=f"t{n}",
+            value={"node": "line\tbreak\n"}, nodegroup_depth=0, source_description="test",
+        )
+        for n in range(5)
+    ]
+
+    cursor = MagicMock()
+    cursor.db.vendor = "sqlite"
+    writer = StagingWriter(cursor, "load", chunk_size=2)
+    assert writer.write(iter(rows)) == 5
+    assert [len(call.args[1]) for call in cursor.executemany.call_args_list] == [2, 2, 1]
+
+    cursor = MagicMock()
+    cursor.db.vendor = "postgresql"
+    writer = StagingWriter(cursor, "load")
+    assert writer.write(rows) == 5
+    buffer = cursor.cursor.copy_expert.call_args.args[1]
+    lines = buffer.getvalue().splitlines()
+    assert len(lines) == 5
+    assert len(lines[0].split("\t")) == len(STAGING_COLUMNS)
+    assert "line\\\\tbreak\\\\n" in lines[0]
+    assert writer.rows == 5
+
+@pytest.mark.django_db
+@context_free
+def test_bulk_record_from_built_resource(arches_orm):
+    import pickle
+    from arches_orm.arches_django.bulk_records import BulkResourceRecord
+    from arches_orm.arches_django.permission_view import PermissionView
+
+    person = arches_orm.models.Person()
+    person.name.append().surnames.surname = "Ashb"
+    person._.to_resource(_no_save=True, _do_index=False)
+
+    record = BulkResourceRecord.from_wkri(person._)
+    assert record.resourceid == str(person._.resource.resourceinstanceid)
+    assert record.model_class_name == "Person"
+    assert {tile.tileid for tile in record.tiles} == {
+        str(tile.tileid) for tile in person._.resource.tiles
+    }
+    assert pickle.loads(pickle.dumps(record)) == record
+
+    with pytest.raises(RuntimeError):
+        BulkResourceRecord.from_wkri(person._, permissions=PermissionView.denied(person._.graphid))
+
+@pytest.mark.django_db
+@context_free
+def test_build_records_in_pool_refuses_transaction(arches_orm, monkeypatch):
+    import multiprocessing
+    from django.db import transaction
+    from arches_orm.arches_django.bulk_records import build_records_in_pool
+
+    def get_context(method):
+        raise AssertionError("Should not fork inside a transaction")
+    monkeypatch.setattr(multiprocessing, "get_context", get_context)
+
+    with transaction.atomic():
+        with pytest.raises(RuntimeError):
+            build_records_in_pool(arches_orm.models.Person._, [{}, {}], processes=2)
+
+def test_chunked_bulk_sender_bounds_chunks(arches_orm):
+    from unittest.mock import MagicMock
+    from arches_orm.arches_django.indexing import ChunkedBulkSender
+
+    search_engine = MagicMock()
+    with ChunkedBulkSender(search_engine, max_bytes=100, max_documents=3, max_in_flight=1) as sender:
+        for n in range(7):
+            sender.add({"_id": n, "_source": {"n": n}})
+        sender.add({"_id": "big", "_source": {"text": "x" * 200}})
+
+    chunks = [call.args[0] for call in search_engine.bulk_index.call_args_list]
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1, 1]
+    assert [item["_id"] for chunk in chunks for item in chunk] == [*range(7), "big"]
+    assert sender.documents == 8
+
+    search_engine = MagicMock()
+    search_engine.bulk_index.side_effect = RuntimeError("bulk index failed")
+    with pytest.raises(RuntimeError):
+        with ChunkedBulkSender(search_engine, max_documents=1, max_in_flight=1) as sender:
+            for n in range(3):
+                sender.add({"_id": n, "_source": {"n": n}})
+
+    search_engine = MagicMock()
+    with pytest.raises(ValueError):
+        with ChunkedBulkSender(search_engine, max_documents=3) as sender:
+            sender.add({"_id": 0, "_source": {}})
+            raise ValueError()
+    search_engine.bulk_index.assert_not_called()
+
+@pytest.mark.django_db
+@context_free
+def test_create_bulk_iter_skips_completed_batches(arches_orm, monkeypatch):
+    from types import SimpleNamespace
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from arches.app.models.models import ETLModule, LoadEvent
+    from arches_orm.arches_django import bulk_create
+
+    ETLModule.objects.create(
+        etlmoduleid=bulk_create.BulkImportWKRM.moduleid,
+        name="Bulk load", icon="", etl_type="import", component="", componentname="",
+    )
+    monkeypatch.setattr(bulk_create, "context", SimpleNamespace(data={"user": User.objects.create(username="bulk")}))
+
+    class _Cursor:
+        # Load events are written, but the load procedures only exist on Postgres.
+        db = SimpleNamespace(vendor="sqlite")
+        rowcount = 0
+
+        def __enter__(self):
+            self._cursor = connection.cursor()
+            self._rows = []
+            return self
+
+        def __exit__(self, *exc):
+            self._cursor.close()
+
+        def execute(self, sql, params=None):
+            if sql.startswith(("INSERT INTO load_event", "UPDATE load_event")):
+                self._cursor.execute(sql, params)
+            self._rows = [(True,)] if "__arches_staging_to_tile" in sql else []
+
+        def executemany(self, sql, params):
+            pass
+
+        def fetchall(self):
+            return self._rows
+
+    monkeypatch.setattr(bulk_create, "connection", SimpleNamespace(cursor=_Cursor))
+
+    Person = arches_orm.models.Person
+    results = list(Person.create_bulk_iter([{}] * 5, batch_size=2, checkpoint="people", do_index=False))
+    assert [len(result) for result in results] == [2, 2, 1]
+    assert sorted(LoadEvent.objects.values_list("load_description", "status")) == [
+        (f"Bulk load people, batch {batch} of size 2", "completed") for batch in range(3)
+    ]
+
+    LoadEvent.objects.filter(load_description="Bulk load people, batch 1 of size 2").update(status="failed")
+    results = list(Person.create_bulk_iter([{}] * 5, batch_size=2, checkpoint="people", do_index=False))
+    assert [len(result) for result in results] == [2]
+    assert LoadEvent.objects.count() == 4
+    assert LoadEvent.objects.filter(load_description="Bulk load people, batch 1 of size 2", status="completed").count() == 1
+
+    # Batches that were loaded but not indexed are not skipped when indexing.
+    assert bulk_create.completed_batches("people", 2) == {0, 1, 2}
+    assert bulk_create.completed_batches("people", 2, indexed=True) == set()
+    with pytest.raises(RuntimeError):
+        Person.create_bulk_iter([{}] * 5, batch_size=3, checkpoint="people")
+
+@pytest.mark.django_db
+@context_free
+def test_update_bulk_stages_only_changed_tiles(arches_orm, monkeypatch):
+    from arches_orm.arches_django.bulk_create import BulkImportWKRM
+
+    Activity = arches_orm.models.Activity
+    activities = [Activity.create(), Activity.create()]
+    StatusEnum = activities[0].record_status_assignment.record_status.__collection__
+
+    staged = []
+    def write_updates(self, pending_saves, changes, do_index=True):
+        staged.extend(
+            (pending.wkri.id, tile.nodegroup_id)
+            for pending in pending_saves
+            for tile in pending.resource.tiles
+            if pending.wkri._tile_has_changed(tile)
+        )
+        return [str(pending.wkri.id) for pending in pending_saves]
+    monkeypatch.setattr(BulkImportWKRM, "write_updates", write_updates)
+
+    updated = Activity.update_bulk([
+        (activity.id, {"record_status_assignment.record_status": StatusEnum.BacklogDashSkeleton})
+        for activity in activities
+    ])
+    assert [activity.id for activity in updated] == [activity.id for activity in activities]
+    assert updated[0].record_status_assignment.record_status == StatusEnum.BacklogDashSkeleton
+    assert {resourceid for resourceid, _ in staged} == {activity.id for activity in activities}
+    assert len({nodegroup_id for _, nodegroup_id in staged}) == 1
+
+@pytest.mark.django_db
+@context_free
+def test_write_updates_stages_deletes_and_refreshes(arches_orm, monkeypatch):
+    import uuid
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from arches_orm.arches_django import bulk_create
+    from arches_orm.arches_django.crosses import CrossChanges
+    from arches_orm.arches_django.staging import STAGING_COLUMNS
+
+    Activity = arches_orm.models.Activity
+    activity = Activity.create()
+    StatusEnum = activity.record_status_assignment.record_status.__collection__
+    activity.record_status_assignment.record_status = StatusEnum.BacklogDashSkeleton
+    pending = activity._._prepare_save()
+    ghost = SimpleNamespace(tileid=uuid.uuid4())
+    pending.ghost_tiles.add(ghost)
+
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    cursor.db.vendor = "sqlite"
+    # Validation finds no errors, then the staged tiles are written.
+    cursor.fetchall.side_effect = [[], [(True,)]]
+    tile_model = MagicMock()
+    refreshed = []
+    monkeypatch.setattr(bulk_create, "connection", SimpleNamespace(cursor=lambda: cursor))
+    monkeypatch.setattr(bulk_create, "context", SimpleNamespace(data={"user": SimpleNamespace(id=1)}))
+    monkeypatch.setattr(bulk_create, "TileModel", tile_model)
+    monkeypatch.setattr(pending.resource, "save_descriptors", lambda: refreshed.append(pending.resource))
+    monkeypatch.setattr(bulk_create, "fetch_resources_with_tiles", lambda resourceids: [pending.resource])
+
+    bulk_etl = bulk_create.BulkImportWKRM()
+    assert bulk_etl.write_updates([pending], CrossChanges(), do_index=False) == [str(activity.id)]
+
+    staged = [
+        dict(zip(STAGING_COLUMNS, values))
+        for call in cursor.executemany.call_args_list
+        for values in call.args[1]
+    ]
+    assert len(staged) == 1
+    assert staged[0]["operation"] == "update"
+    assert staged[0]["resourceid"] == activity.id
+    assert staged[0]["loadid"] == bulk_etl.loadid
+    tile_model.objects.filter.assert_called_once_with(tileid__in=[ghost.tileid])
+    tile_model.objects.filter.return_value.delete.assert_called_once()
+    assert refreshed == [pending.resource]
+    assert not any(pending.wkri._tile_has_changed(tile) for tile in pending.resource.tiles)
+
+@pytest.mark.django_db
+@context_free
+def test_delete_bulk_removes_resources_and_sends_one_signal(arches_orm, monkeypatch):
+    import re
+    from types import SimpleNamespace
+    from django.contrib.auth.models import Permission, User
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connection
+    from guardian.models import UserObjectPermission
+    from arches.app.models.models import ResourceInstance, ResourceXResource, TileModel
+    from arches_orm.arches_django import bulk_delete
+
+    # The bulk delete is written for Postgres, so its arrays, casts and jsonb
+    # are rewritten here to run against the SQLite test database.
+    placeholder = re.compile(r"(?P<op>=\s*ANY|<>\s*ALL)\((?:%s|%\((?P<array>\w+)\)s)::\w+\[\]\)|%s|%\((?P<name>\w+)\)s")
+    def to_sqlite(sql, params):
+        if sql.startswith("UPDATE tiles SET tiledata"):
+            sql = """UPDATE tiles SET tiledata = json_set(tiledata, '$."' || %(nodeid)s || '"', json((
+                SELECT json_group_array(json(item.value)) FROM json_each(tiledata, '$."' || %(nodeid)s || '"') AS item
+                WHERE json_extract(item.value, '$.resourceId') <> ALL(%(ids)s::text[])
+            ))) WHERE tileid IN""" + sql.split("WHERE tileid IN", 1)[1]
+        sql = sql.replace("INSERT INTO edit_log (", "INSERT INTO edit_log (editlogid, ")
+        sql = sql.replace("SELECT graphid", "SELECT lower(hex(randomblob(16))), graphid").replace("now()", "CURRENT_TIMESTAMP")
+        positional, values = iter(params if isinstance(params, list) else []), []
+        def replace(match):
+            name = match["array"] or match["name"]
+            value = params[name] if name else next(positional)
+            if not match["op"]:
+                values.append(value)
+                return "%s"
+            values.extend(value)
+            return f"{'IN' if 'ANY' in match['op'] else 'NOT IN'} ({', '.join(['%s'] * len(value))})"
+        return re.sub(r"::\w+", "", placeholder.sub(replace, sql)), values
+
+    class _Cursor:
+        def __enter__(self):
+            self._cursor = connection.cursor()
+            return self
+
+        def __exit__(self, *exc):
+            self._cursor.close()
+
+        def execute(self, sql, params=None):
+            self._cursor.execute(*to_sqlite(sql, params))
+
+        def fetchall(self):
+            return self._cursor.fetchall()
+
+    monkeypatch.setattr(bulk_delete, "connection", SimpleNamespace(cursor=_Cursor))
+
+    Activity = arches_orm.models.Activity
+    activities = [Activity.create(), Activity.create()]
+    deleted_ids = [str(activities[0].id), str(activities[1].id)]
+    kept = Activity.create()
+    person = arches_orm.models.Person.create()
+    person.associated_activities.append(activities[0])
+    person.associated_activities.append(kept)
+    person.save()
+    content_type = ContentType.objects.get_for_model(ResourceInstance)
+    UserObjectPermission.objects.create(
+        user=User.objects.create(username="bulk-delete"),
+        content_type=content_type,
+        object_pk=deleted_ids[0],
+        permission=Permission.objects.get(content_type=content_type, codename="delete_resourceinstance"),
+    )
+    assert ResourceXResource.objects.filter(resourceinstanceidto_id=deleted_ids[0]).exists()
+
+    signals = []
+    def on_delete(sender, resourceinstanceids, **kwargs):
+        signals.append(resourceinstanceids)
+    Activity.post_bulk_delete.connect(on_delete)
+
+    with pytest.raises(RuntimeError):
+        Activity.delete_bulk([person.id])
+    assert sorted(Activity.delete_bulk(deleted_ids, do_index=False)) == sorted(deleted_ids)
+    assert [sorted(ids) for ids in signals] == [sorted(deleted_ids)]
+
+    assert not ResourceInstance.objects.filter(resourceinstanceid__in=deleted_ids).exists()
+    assert not TileModel.objects.filter(resourceinstance_id__in=deleted_ids).exists()
+    assert not ResourceXResource.objects.filter(resourceinstanceidto_id__in=deleted_ids).exists()
+    assert not UserObjectPermission.objects.filter(object_pk__in=deleted_ids).exists()
+    assert ResourceXResource.objects.filter(resourceinstanceidto_id=kept.id).exists()
+
+    reloaded_person = arches_orm.models.Person.find(person.id)
+    assert [activity.id for activity in reloaded_person.associated_activities] == [kept.id]
+
+@pytest.mark.django_db
+def test_delete_resources_in_one_transaction(arches_orm, monkeypatch):
+    import uuid
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from django.contrib.auth.models import Permission, User
+    from django.contrib.contenttypes.models import ContentType
+    from guardian.models import UserObjectPermission
+    from arches.app.models.models import ResourceInstance
+    from arches_orm.arches_django import bulk_delete
+
+    resourceid, missing, referrer, nodeid = (str(uuid.uuid4()) for _ in range(4))
+    content_type = ContentType.objects.get_for_model(ResourceInstance)
+    UserObjectPermission.objects.create(
+        user=User.objects.create(username="bulk-delete"),
+        content_type=content_type,
+        object_pk=resourceid,
+        permission=Permission.objects.get(content_type=content_type, codename="delete_resourceinstance"),
+    )
+
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    # The resources that exist, then the tiles of other resources referring to them.
+    cursor.fetchall.side_effect = [[(resourceid,)], [(referrer, nodeid)]]
+    monkeypatch.setattr(bulk_delete, "connection", SimpleNamespace(cursor=lambda: cursor))
+
+    deleted, referring = bulk_delete.delete_resources([resourceid, missing], user=SimpleNamespace(id=1))
+    assert deleted == [resourceid]
+    assert referring == {referrer}
+    statements = [" ".join(call.args[0].split()) for call in cursor.execute.call_args_list]
+    assert any(statement.startswith("UPDATE tiles SET tiledata") for statement in statements)
+    assert [statement.split(" WHERE")[0] for statement in statements if statement.startswith("DELETE")] == [
+        "DELETE FROM resource_x_resource",
+        "DELETE FROM geojson_geometries",
+        "DELETE FROM files",
+        "DELETE FROM tiles",
+        "DELETE FROM resource_instances",
+    ]
+    assert not UserObjectPermission.objects.filter(object_pk=resourceid).exists()
+
+@pytest.mark.django_db
+@context_free
+def test_deletable_resource_ids_in_one_pass(arches_orm):
+    import uuid
+    from django.contrib.auth.models import Permission, User
+    from django.contrib.contenttypes.models import ContentType
+    from guardian.models import UserObjectPermission
+    from arches.app.models.models import ResourceInstance
+    from arches_orm.arches_django.resource_permissions import deletable_resource_ids
+
+    Person = arches_orm.models.Person
+    denied, permitted, implied = (str(Person.create().id) for _ in range(3))
+    missing = str(uuid.uuid4())
+    user = User.objects.create(username="deletable-resources")
+    content_type = ContentType.objects.get_for_model(ResourceInstance)
+    for resourceid, codename in ((denied, "no_access_to_resourceinstance"), (permitted, "delete_resourceinstance")):
+        UserObjectPermission.objects.create(
+            user=user,
+            content_type=content_type,
+            object_pk=resourceid,
+            permission=Permission.objects.get(content_type=content_type, codename=codename),
+        )
+
+    resourceids = [denied, permitted, implied, missing]
+    assert deletable_resource_ids(user, resourceids, Person.graphid) == {permitted, implied, missing}
+    user.is_superuser = True
+    assert deletable_resource_ids(user, [denied], Person.graphid) == {denied}
+
+def test_index_queue_coalesces_and_defers(arches_orm, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+    from django.db import transaction
+    from arches_orm.arches_django import index_queue
+
+    flushed = []
+    monkeypatch.setattr(
+        index_queue, "fetch_resources_with_tiles",
+        lambda ids: [SimpleNamespace(resourceinstanceid=resourceid) for resourceid in ids]
+    )
+    monkeypatch.setattr(
+        index_queue, "index_resources",
+        lambda resources_and_wrappers, fetch_tiles: flushed.append(
+            [(resource.resourceinstanceid, wrapper) for resource, wrapper in resources_and_wrappers]
+        ) or len(resources_and_wrappers)
+    )
+
+    queue = index_queue.IndexQueue()
+    with queue.deferred():
+        queue.add("Person", ["a", "b"])
+        with queue.deferred():
+            queue.add("Person", ["a"])
+        # A flush from another context leaves this context's resources alone.
+        thread = threading.Thread(target=queue.flush)
+        thread.start()
+        thread.join()
+        assert not flushed
+        assert len(queue) == 2
+    assert flushed == [[("a", "Person"), ("b", "Person")]]
+    assert queue.flush() == 0
+
+    # Resources are only queued once the transaction saving them commits.
+    flushed.clear()
+    with transaction.atomic():
+        queue.add("Person", ["c"], flush=False)
+        assert queue.flush() == 0
+    assert queue.flush() == 1
+    assert flushed == [[("c", "Person")]]
+
+def test_load_report_times_spans(arches_orm):
+    from arches_orm.arches_django.load_report import LoadReport
+
+    received = []
+    report = LoadReport(loadid="load", sink=lambda span, report: received.append((span.name, span.rows)))
+    with report.span("staging") as span:
+        span.rows = 3
+    with report.span("crosses", rows=2):
+        pass
+    with pytest.raises(ValueError):
+        with report.span("crosses"):
+            raise ValueError()
+
+    assert received == [("staging", 3), ("crosses", 2), ("crosses", None)]
+    assert set(report.durations()) == {"staging", "crosses"}
+    assert report.duration == sum(span.duration for span in report.spans)
+
+@pytest.mark.django_db
+@context_free
+def test_geojson_nodes_for_bulk_loads(arches_orm):
+    from arches_orm.arches_django.bulk_create import geojson_nodes
+
+    Activity = arches_orm.models.Activity
+    nodes = geojson_nodes([Activity._])
+    assert nodes
+    assert {Activity._._node_datatypes()[nodeid] for nodeid in nodes} == {"geojson-feature-collection"}
+    assert geojson_nodes([]) == frozenset()
+
+@pytest.mark.django_db
+def test_permission_cache_bounds_and_invalidation(arches_orm, monkeypatch):
+    from django.contrib.auth.models import Group, User
+    from arches_orm.adapter import get_adapter
+    from arches_orm.arches_django import permission_cache
+
+    calls = []
+    check = lambda: calls.append(1) or True
+    cache = permission_cache.PermissionCache()
+    cache.get_or_set("read_graph", 1, "g1", check)
+    cache.get_or_set("read_graph", 1, "g1", check)
+    assert len(calls) == 2
+    assert len(cache) == 0
+    calls.clear()
+
+    cache = permission_cache.PermissionCache(ttl=10, max_size=2)
+    assert cache.get_or_set("read_graph", 1, "g1", check)
+    assert cache.get_or_set("read_graph", 1, "g1", check)
+    assert len(calls) == 1
+    cache.get_or_set("read_graph", 1, "g2", check)
+    cache.get_or_set("read_graph", 2, "g1", check)
+    assert len(cache) == 2
+    cache.get_or_set("read_graph", 1, "g1", check)
+    assert len(calls) == 4
+
+    now = permission_cache.time.monotonic()
+    monkeypatch.setattr(permission_cache.time, "monotonic", lambda: now + 11)
+    cache.get_or_set("read_graph", 1, "g1", check)
+    assert len(calls) == 5
+    monkeypatch.undo()
+
+    adapter = get_adapter("arches-django")
+    monkeypatch.setattr(adapter, "_permission_cache", cache)
+    user = User.objects.create(username="permission-cache")
+    cache.get_or_set("read_graph", user.pk, "g1", check)
+    cache.get_or_set("read_graph", 2, "g1", check)
+    user.groups.add(Group.objects.create(name="permission-cache"))
+    assert len(cache) == 1
+    Group.objects.get(name="permission-cache").delete()
+    assert len(cache) == 0
+
+@pytest.mark.django_db
+def test_readable_resource_ids_in_one_pass(arches_orm):
+    import uuid
+    from django.contrib.auth.models import Permission, User
+    from django.contrib.contenttypes.models import ContentType
+    from guardian.models import UserObjectPermission
+    from arches.app.models.models import ResourceInstance
+    from arches_orm.arches_django.resource_permissions import readable_resource_ids
+
+    user = User.objects.create(username="readable-resources")
+    denied, permitted, implied = (str(uuid.uuid4()) for _ in range(3))
+    content_type = ContentType.objects.get_for_model(ResourceInstance)
+    for resourceid, codename in ((denied, "no_access_to_resourceinstance"), (permitted, "view_resourceinstance")):
+        UserObjectPermission.objects.create(
+            user=user,
+            content_type=content_type,
+            object_pk=resourceid,
+            permission=Permission.objects.get(content_type=content_type, codename=codename),
+        )
+
+    assert readable_resource_ids(user, [denied, permitted, implied], True) == {permitted, implied}
+    assert readable_resource_ids(user, [denied, permitted, implied], False) == {permitted}
+    user.is_superuser = True
+    assert readable_resource_ids(user, [denied], False) == {denied}
+
+@pytest.mark.django_db
+def test_permission_view_separates_read_and_write(arches_orm, monkeypatch):
+    from django.contrib.auth.models import User
+    from arches_orm.adapter import get_adapter
+    from arches_orm.arches_django import wrapper
+
+    Person = arches_orm.models.Person
+    nodegroups = list(Person._._nodegroup_objects())
+    monkeypatch.setattr(wrapper, "user_can_read_graph", lambda user, graph: True)
+    monkeypatch.setattr(wrapper, "get_readable_nodegroups", lambda user: nodegroups)
+    monkeypatch.setattr(wrapper, "get_permitted_nodegroups", lambda user: nodegroups[:1])
+
+    with get_adapter().context(user=User.objects.create(username="read-only")):
+        view = Person._._permission_view()
+        assert view is Person._._permission_view()
+        assert all(view.can_read(nodegroup) for nodegroup in nodegroups)
+        assert view.can_write(nodegroups[0])
+        assert not any(view.can_write(nodegroup) for nodegroup in nodegroups[1:])
+        assert not view.can_read(None)
+
+    with get_adapter().context_free():
+        assert Person._._permission_view().writable == Person._._permission_view().readable
+
+@pytest.mark.django_db
+@context_free
+def test_hydrated_resource_memory(arches_orm, person_ashs, record_property):
+    import sys
+    import tracemalloc
+    from arches_orm.arches_django.pseudo_nodes import PseudoNodeList, PseudoNodeValue, PseudoNodeUnavailable
+    from arches_orm.view_models import SemanticViewModel
+
+    for cls in (PseudoNodeList, PseudoNodeValue, PseudoNodeUnavailable, SemanticViewModel):
+        assert "__dict__" not in dir(cls)
+
+    # Load once first, so graph metadata cached on first use is not counted.
+    arches_orm.models.Person.find(person_ashs.id)._.get_root().value.get_children()
+    count = 20
+    tracemalloc.start()
+    try:
+        resources = [arches_orm.models.Person.find(person_ashs.id) for _ in range(count)]
+        for resource in resources:
+            resource._.get_root().value.get_children()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    record_property("bytes_per_hydrated_resource", current // count)
+
+    # The hydrated pseudo-nodes and semantic view models carry no instance dict.
+    hydrated = [
+        pseudo_node
+        for resource in resources
+        for pseudo_nodes in resource._._values.data.values()
+        for pseudo_node in pseudo_nodes
+    ]
+    hydrated += [item for pseudo_node in hydrated if isinstance(pseudo_node, PseudoNodeList) for item in pseudo_node]
+    hydrated += [
+        pseudo_node.value
+        for pseudo_node in hydrated
+        if isinstance(pseudo_node, PseudoNodeValue) and isinstance(pseudo_node.value, SemanticViewModel)
+    ]
+    assert any(isinstance(obj, SemanticViewModel) for obj in hydrated)
+    assert all(type(obj).__dictoffset__ == 0 for obj in hydrated)
+
+    # Each is smaller than an equivalent instance holding the same attributes in a dict.
+    class Unslotted:
+        pass
+    def unslotted_size(obj):
+        unslotted = Unslotted()
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                try:
+                    setattr(unslotted, name, object.__getattribute__(obj, name))
+                except AttributeError:
+                    pass
+        return sys.getsizeof(unslotted) + sys.getsizeof(unslotted.__dict__)
+    slotted_bytes = sum(sys.getsizeof(obj) for obj in hydrated)
+    unslotted_bytes = sum(unslotted_size(obj) for obj in hydrated)
+    record_property("slotted_bytes", slotted_bytes)
+    record_property("unslotted_bytes", unslotted_bytes)
+    assert slotted_bytes < unslotted_bytes
+
+    first, second = (
+        arches_orm.models.Person._._make_pseudo_node_cls("name", single=True)
+        for _ in range(2)
+    )
+    assert first._child_nodes is second._child_nodes
+
+@pytest.mark.django_db
+@context_free
+def test_semantic_children_found_by_tile(arches_orm):
+    Person = arches_orm.models.Person
+    person = Person.create()
+    for full_name in ("Ash", "Birch", "Cedar"):
+        person.name.append().full_name = full_name
+    person.save()
+
+    reloaded = Person.find(person.id)
+    assert [name.full_name for name in reloaded.name] == ["Ash", "Birch", "Cedar"]
+
+    values = reloaded._._values
+    full_names = values["full_name"]
+    name_node = Person._._node_objects_by_alias()["name"]
+    child_nodes = Person._._graph_index().child_nodes[str(name_node.nodeid)]
+    for full_name in full_names:
+        candidates = values.child_candidates(child_nodes, full_name.tile)
+        assert [value for key, value in candidates if key == "full_name"] == [full_name]
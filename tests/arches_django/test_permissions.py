@@ -39,10 +39,13 @@ def test_can_attach_related_then_save(arches_orm, lazy, owner, User, person_ash,
 
         with (
             patch("arches_orm.arches_django.wrapper.get_permitted_nodegroups", png) as _,
+            patch("arches_orm.arches_django.wrapper.get_readable_nodegroups", png) as _,
             patch("arches_orm.arches_django.wrapper.user_can_read_resource", lambda user, resource: True) as __,
             patch("arches_orm.arches_django.wrapper.user_can_read_graph", lambda user, graph: True) as __,
             patch("arches_orm.arches_django.wrapper.user_can_edit_resource", lambda user, resource: True) as ___
         ):
+            # Patching the checks bypasses the signals that would invalidate cached permissions.
+            get_adapter().invalidate_permissions()
             with get_adapter().context(user=owner) as cvar:
                 reloaded_person = arches_orm.models.Person.find(person_ashs.id)
                 activity = arches_orm.models.Activity()
@@ -70,3 +73,35 @@ def test_can_attach_related_then_save(arches_orm, lazy, owner, User, person_ash,
 @pytest.mark.parametrize("lazy", [False, True])
 def test_can_only_view_permissioned_resources(arches_orm, lazy, owner, User, person_ash):
     ...
+
+@pytest.mark.django_db
+def test_identity_map_shares_instances_in_context(arches_orm, owner, person_ash):
+    with get_adapter().context_free() as cvar:
+        person_ashs = person_ash.save()
+
+    def png(user):
+        return list(arches_orm.models.Person._nodegroup_objects())
+
+    with (
+        patch("arches_orm.arches_django.wrapper.get_permitted_nodegroups", png) as _,
+        patch("arches_orm.arches_django.wrapper.get_readable_nodegroups", png) as _,
+        patch("arches_orm.arches_django.wrapper.user_can_read_resource", lambda user, resource: True) as __,
+        patch("arches_orm.arches_django.wrapper.user_can_read_graph", lambda user, graph: True) as __,
+        patch("arches_orm.arches_django.wrapper.user_can_edit_resource", lambda user, resource: True) as ___
+    ):
+        with get_adapter().context(user=owner) as cvar:
+            identity_map = get_adapter().get_identity_map()
+            first = arches_orm.models.Person.find(person_ashs.id)
+            assert arches_orm.models.Person.find(person_ashs.id) is first
+            assert identity_map.stats["hits"] == 1
+            assert arches_orm.models.Person.find(person_ashs.id, lazy=True) is not first
+            assert arches_orm.models.Person.find_many([person_ashs.id])[0] is first
+            assert arches_orm.models.Person.find_many([person_ashs.id], fields=["name"])[0] is not first
+            with pytest.raises(RuntimeError):
+                arches_orm.models.Activity.find_many([person_ashs.id])
+
+            first.save()
+            assert arches_orm.models.Person.find(person_ashs.id) is not first
+
+        with get_adapter().context(user=owner) as cvar:
+            assert arches_orm.models.Person.find(person_ashs.id) is not first